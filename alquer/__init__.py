@@ -0,0 +1,9 @@
+"""
+Moteur du jeu d'alquerkonane, utilisable sans interface graphique
+"""
+
+from .rules import BLACK, WHITE, MOVES, TAKES, start_position
+from .bitboard import BitState, Geometry, geometry
+from .state import GameState
+from .transposition import TranspositionTable, table
+from .symmetry import Symmetries
@@ -0,0 +1,176 @@
+"""
+IA à temps borné : alpha-bêta par approfondissement itératif
+
+La recherche est refaite à des profondeurs croissantes tant que le temps accordé au coup n'est pas écoulé ;
+le coup joué est le meilleur de la dernière profondeur terminée. Aux feuilles, une position est estimée par
+le matériel (nombre de pions), la mobilité (nombre de coups de chaque joueur) et l'avancement des pions, du
+point de vue du joueur courant. Une position déjà résolue (table de transposition du calcul du gagnant, base
+sur disque) vaut sa valeur exacte : l'IA joue parfaitement dès que le calcul exact a pu se faire.
+
+Les estimations (profondeur, valeur, borne, meilleur coup) sont conservées d'un coup à l'autre.
+"""
+
+from time import perf_counter
+
+from .bitboard import BitState
+from .rules import BLACK
+from .transposition import table as default_table
+
+# valeur d'une position gagnée, diminuée du nombre de coups pour préférer les gains rapides
+WIN = 10**6
+MAX_DEPTH = 200
+# au-delà, en valeur absolue, une valeur est un gain ou une perte prouvé
+MATE = WIN - MAX_DEPTH
+
+MATERIAL = 100
+MOBILITY = 10
+ADVANCE = 1
+
+# bornes des valeurs mémorisées
+EXACT, LOWER, UPPER = 0, 1, 2
+
+MAX_ENTRIES = 2**20
+
+# nombre de positions examinées entre deux lectures de l'horloge : une position coûte quelques dizaines de µs,
+# le budget est dépassé de quelques ms au plus même avec --think 0.05
+CLOCK_NODES = 128
+
+
+class TimeUp(Exception):
+    pass
+
+
+def cache_score(score, ply):
+    """valeur à mémoriser pour une position examinée à ply coups de la racine : un gain ou une perte prouvé est
+    compté en coups depuis cette position, et non depuis la racine, pour valoir quelle que soit la position où elle
+    est retrouvée
+    """
+    if score >= MATE:
+        return score + ply
+    if score <= -MATE:
+        return score - ply
+    return score
+
+
+def search_score(score, ply):
+    """valeur mémorisée par cache_score, ramenée à une position retrouvée à ply coups de la racine"""
+    if score >= MATE:
+        return score - ply
+    if score <= -MATE:
+        return score + ply
+    return score
+
+
+class AlphaBeta:
+    """Choix d'un coup en au plus budget secondes et max_depth coups de profondeur ; table et database donnent
+    les positions résolues
+    """
+
+    def __init__(self, budget=1.0, table=default_table, database=None, max_depth=MAX_DEPTH):
+        self.budget = budget
+        self.max_depth = max_depth
+        self.table = table
+        self.database = database
+        self.cache = {}
+        self.nodes = 0
+        self.depth = 0
+
+    def exact(self, key):
+        """1 si le joueur courant de la position (clé canonique) key gagne, 0 s'il perd, None si inconnu"""
+        wins = self.table.get(key)
+        if wins is None and self.database is not None:
+            wins = self.database.get(key)
+        return wins
+
+    def evaluate(self, state):
+        """estimation de la position state pour son joueur courant"""
+        pawns, ennemies = state.pawns()
+        opponent = BitState(state.geo, state.packed ^ 1)
+        material = pawns.bit_count() - ennemies.bit_count()
+        mobility = state.count_moves() - opponent.count_moves()
+        advance = self.advance(pawns, state.player) - self.advance(ennemies, 1 - state.player)
+        return MATERIAL * material + MOBILITY * mobility + ADVANCE * advance
+
+    def advance(self, bits, player):
+        """nombre total de lignes parcourues par les pions bits du joueur player"""
+        rows = self.rows
+        last = len(rows) - 1
+        return sum((i if player == BLACK else last - i) * (bits & row).bit_count() for i, row in enumerate(rows))
+
+    def best_move(self, state):
+        """meilleur coup interne (voir BitState.moves) de state, trouvé dans le temps imparti"""
+        geo = state.geo
+        self.rows = [((1 << geo.width) - 1) << (i * geo.width) for i in range(geo.height)]
+        self.deadline = perf_counter() + self.budget
+        self.nodes = 0
+        if len(self.cache) > MAX_ENTRIES:
+            self.cache.clear()
+        moves = state.moves()
+        # un coup qui mène à une position déjà résolue perdante pour l'adversaire
+        for move in moves:
+            child = state.play(move)
+            if not child.has_moves() or self.exact(geo.canonical(child.key())) == 0:
+                return move
+        best = moves[0]
+        for depth in range(1, self.max_depth + 1):
+            try:
+                score, move = self.root(state, moves, best, depth)
+            except TimeUp:
+                break
+            best, self.depth = move, depth
+            if abs(score) >= MATE:
+                # gain ou perte prouvé : inutile d'aller plus loin
+                break
+        return best
+
+    def root(self, state, moves, first, depth):
+        alpha, best = -WIN - 1, first
+        # le meilleur coup de la profondeur précédente d'abord
+        for move in [first] + [m for m in moves if m != first]:
+            score = -self.search(state.play(move), depth - 1, -WIN - 1, -alpha, 1)
+            if score > alpha:
+                alpha, best = score, move
+        return alpha, best
+
+    def search(self, state, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.nodes % CLOCK_NODES == 0 and perf_counter() > self.deadline:
+            raise TimeUp
+        key = state.key()
+        wins = self.exact(state.geo.canonical(key))
+        if wins is not None:
+            return WIN - ply if wins else ply - WIN
+        moves = state.moves()
+        if not moves:
+            return ply - WIN
+        if depth == 0:
+            return self.evaluate(state)
+        entry = self.cache.get(key)
+        first = None
+        if entry is not None:
+            entry_depth, score, bound, first = entry
+            score = search_score(score, ply)
+            if entry_depth >= depth and (bound == EXACT or (bound == LOWER and score >= beta)
+                                         or (bound == UPPER and score <= alpha)):
+                return score
+        # meilleur coup mémorisé, puis prises, puis déplacements
+        moves.sort(key=lambda m: (m != first, not m[2]))
+        original_alpha, best_score, best = alpha, -WIN - 1, moves[0]
+        for move in moves:
+            score = -self.search(state.play(move), depth - 1, -beta, -alpha, ply + 1)
+            if score > best_score:
+                best_score, best = score, move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+        bound = UPPER if best_score <= original_alpha else LOWER if best_score >= beta else EXACT
+        self.cache[key] = depth, cache_score(best_score, ply), bound, best
+        return best_score
+
+
+def best_move(state, ai):
+    """coup (en coordonnées, comme GameState.get_moves) choisi par ai pour un état GameState ou BitState"""
+    if not isinstance(state, BitState):
+        state = BitState.create(state.width, state.height, state.black, state.white, state.player)
+    return state.coordinates(ai.best_move(state))
@@ -0,0 +1,191 @@
+"""
+Calcul du gagnant pour une grille de configurations, sans interface graphique
+python -m alquer.batch -W 3 4 5 -H 3 4 5 -l 1 2 -s 0 1 --timeout 600 --memory 2048 [--markdown table.md]
+
+Chaque configuration (largeur, hauteur, lignes, joueur qui commence) est résolue dans son propre processus,
+limité à --memory Mo et arrêté après --timeout secondes. Autant de configurations que le permettent --jobs et
+la mémoire de la machine sont résolues en même temps. Chaque résultat est écrit dès qu'il est connu, sous forme
+d'une ligne JSON (JSON Lines) : configuration, status (solved, timeout, memory, error), gagnant, temps,
+positions examinées et taille de la table de transposition.
+
+Avec --checkpoint DIR, les positions résolues de chaque configuration sont sauvegardées périodiquement dans
+DIR (voir alquer/checkpoint.py), ainsi qu'à l'arrêt du calcul (--timeout, Ctrl-C, SIGTERM d'une machine
+préemptée) ; relancer la même commande reprend chaque configuration là où elle s'était arrêtée.
+"""
+
+import argparse
+import json
+import os
+import resource
+import signal
+import sys
+from itertools import product
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+from time import perf_counter
+
+from .bitboard import BitState
+from .checkpoint import CHECKPOINT_DELAY, Checkpoint
+from .engine import SOLVERS, board_arguments, normalise_lines
+from .rules import BLACK
+from .solver import Interrupted
+from .transposition import TranspositionTable
+
+COLORS = 'black', 'white'
+
+# part du plafond mémoire d'une configuration réservée à la table de transposition
+TABLE_SHARE = 0.5
+
+
+def configurations(widths, heights, lines, starts):
+    """configurations distinctes de la grille, dans l'ordre, nombres de lignes ramenés par normalise_lines"""
+    grid = []
+    for width, height, line, start in product(widths, heights, lines, starts):
+        config = width, height, normalise_lines(height, line), start
+        if config not in grid:
+            grid.append(config)
+    return grid
+
+
+def physical_memory():
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def checkpoint_path(directory, config):
+    width, height, lines, start = config
+    return os.path.join(directory, f'{width}x{height}-{lines}-{COLORS[start]}.db')
+
+
+def solve(connection, config, max_bytes, method, checkpoint=None):
+    """calcul dans le processus fils, le résultat est envoyé par connection ;
+    checkpoint est le couple (répertoire, intervalle) des sauvegardes, ou None
+    """
+    width, height, lines, start = config
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
+    except (ValueError, OSError):
+        # plafond non modifiable (ou non respecté, par exemple sous macOS) : seule la table est bornée
+        pass
+    table = TranspositionTable(int(max_bytes * TABLE_SHARE))
+    solver = SOLVERS[method](table)
+    saved = {}
+    if checkpoint is not None:
+        directory, interval = checkpoint
+        solver.progress = Checkpoint(checkpoint_path(directory, config), width, height, interval)
+        saved['resumed'] = solver.progress.resume(solver)
+        # arrêt demandé (--timeout, Ctrl-C, machine préemptée) : le suivi lève Interrupted à la position suivante,
+        # hors de toute écriture dans la table, et la dernière sauvegarde est faite avant de s'arrêter
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda signum, frame: solver.progress.stop())
+    try:
+        # tableaux de la table et géométrie du damier préparés avant de lancer le chronomètre
+        table.allocate()
+        state = BitState.initial(width, height, lines, start)
+        t_start = perf_counter()
+        winner = solver.winner(state)
+        elapsed = round(perf_counter() - t_start, 3)
+        if checkpoint is not None:
+            saved['saved'] = solver.progress.save(solver)
+        connection.send({'status': 'solved', 'winner': COLORS[winner], 'time': elapsed,
+                         'nodes': solver.nodes, 'cache_entries': len(table), **saved})
+    except (Interrupted, KeyboardInterrupt):
+        if checkpoint is not None:
+            solver.progress.save(solver)
+    except MemoryError:
+        connection.send({'status': 'memory'})
+
+
+def run(grid, jobs, timeout, max_bytes, method, checkpoint=None):
+    """générateur des résultats des configurations de grid, dans l'ordre où ils sont connus"""
+    waiting = list(reversed(grid))
+    running = {}
+    while waiting or running:
+        while waiting and len(running) < jobs:
+            config = waiting.pop()
+            receiver, sender = Pipe(duplex=False)
+            process = Process(target=solve, args=(sender, config, max_bytes, method, checkpoint),
+                              daemon=True)
+            process.start()
+            sender.close()
+            running[receiver] = config, process, perf_counter()
+        deadline = min(started + timeout for _, _, started in running.values()) if timeout else None
+        ready = wait(list(running), None if deadline is None else max(0, deadline - perf_counter()))
+        now = perf_counter()
+        for receiver in list(running):
+            config, process, started = running[receiver]
+            if receiver in ready:
+                try:
+                    result = receiver.recv()
+                except EOFError:
+                    # processus mort sans résultat, le plus souvent tué faute de mémoire
+                    process.join()
+                    result = {'status': 'error', 'exitcode': process.exitcode}
+            elif timeout and now - started >= timeout:
+                process.terminate()
+                result = {'status': 'timeout', 'time': round(now - started, 3)}
+            else:
+                continue
+            del running[receiver]
+            receiver.close()
+            process.join()
+            width, height, lines, start = config
+            yield {'width': width, 'height': height, 'lines': lines, 'start': COLORS[start], **result}
+
+
+def markdown(results):
+    """lignes du tableau "Positions gagnantes" du README pour les configurations résolues"""
+    rows = []
+    for result in sorted(results, key=lambda r: (r['width'], r['height'], r['lines'], r['start'] != COLORS[BLACK])):
+        if result['status'] == 'solved':
+            size = f"{result['width']} x {result['height']}"
+            rows.append(f"| {size:<22}|{result['lines']:^18}| {result['start']:<16}| {result['winner']:<8}|")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="calcul du gagnant d'une grille de configurations")
+    board_arguments(parser, grid=True, start=[0, 1], memory=1024,
+                    memory_help='Mémoire maximale (en Mo) par configuration')
+    parser.add_argument('-j', '--jobs', help='Nombre maximal de calculs simultanés', type=int,
+                        default=os.cpu_count())
+    parser.add_argument('-t', '--timeout', help='Temps maximal (en s) par configuration', type=float)
+    parser.add_argument('--solver', help='dfs (par défaut) ou pn', choices=tuple(SOLVERS), default='dfs')
+    parser.add_argument('-o', '--output', help='Fichier JSON Lines, sortie standard par défaut')
+    parser.add_argument('--markdown', help='Fichier où écrire les lignes du tableau du README')
+    parser.add_argument('--checkpoint', help='Répertoire des sauvegardes, pour reprendre les calculs interrompus')
+    parser.add_argument('--checkpoint-every', help='Secondes entre deux sauvegardes (au moins), 60 par défaut',
+                        type=float, default=CHECKPOINT_DELAY)
+    args = parser.parse_args()
+
+    grid = configurations(args.width, args.height, args.lines, args.start)
+    max_bytes = args.memory * 2**20
+    jobs = max(1, args.jobs)
+    memory = physical_memory()
+    if memory:
+        # pas plus de calculs simultanés que la mémoire ne peut en contenir
+        jobs = max(1, min(jobs, memory // max_bytes))
+
+    checkpoint = None
+    if args.checkpoint:
+        os.makedirs(args.checkpoint, exist_ok=True)
+        checkpoint = args.checkpoint, args.checkpoint_every
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    results = []
+    try:
+        for result in run(grid, jobs, args.timeout, max_bytes, args.solver, checkpoint):
+            results.append(result)
+            print(json.dumps(result), file=output, flush=True)
+    finally:
+        if args.output:
+            output.close()
+    if args.markdown:
+        with open(args.markdown, 'w') as file:
+            file.write('\n'.join(markdown(results)) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+"""
+Représentation d'un état du jeu par deux entiers (bitboards)
+La case (i, j) correspond au bit d'indice i * width + j
+"""
+
+from dataclasses import dataclass
+from functools import cache
+
+from .rules import BLACK, MOVES, TAKES, start_position
+from .solver import solver
+from .symmetry import Symmetries
+
+
+class Geometry:
+    """Masques précalculés pour un damier width x height, partagés par tous les états de cette taille"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        squares = [divmod(s, width) for s in range(self.size)]
+        # steps[player][s] : bits d'arrivée des déplacements simples depuis la case s
+        self.steps = tuple(tuple(tuple(self.bit(i + di, j + dj) for di, dj in moves if self.inside(i + di, j + dj))
+                                 for i, j in squares)
+                           for moves in MOVES)
+        # jumps[s] : couples (bit d'arrivée, bit du pion pris) des prises depuis la case s
+        self.jumps = tuple(tuple((self.bit(i + di, j + dj), self.bit(i + di//2, j + dj//2))
+                                 for di, dj in TAKES if self.inside(i + di, j + dj))
+                           for i, j in squares)
+        # count_moves / has_moves traitent tous les pions à la fois : pour chaque direction, (décalage à gauche,
+        # décalage à droite, masque des cases de départ dont l'arrivée est dans le damier)
+        self.full = (1 << self.size) - 1
+        # décalage des pions noirs dans une clé de position (voir BitState.key)
+        self.black_shift = self.size + 1
+        self.step_shifts = tuple(tuple(self.shift(di, dj) for di, dj in moves) for moves in MOVES)
+        # pour les prises, le décalage mène au pion pris, le masque garantit que la case d'arrivée existe
+        self.jump_shifts = tuple(self.shift(di, dj) for di, dj in TAKES)
+        # mêmes tables en coordonnées pour GameState (alquer/state.py), avec les coups déjà construits :
+        # step_moves[player][i, j] : couples (arrivée, coup) des déplacements simples depuis la case (i, j),
+        # jump_moves[i, j] : triplets (arrivée, pion pris, coup) des prises depuis (i, j)
+        self.step_moves = tuple({(i, j): tuple(((i + di, j + dj), ((i + di, j + dj), (i, j), None))
+                                               for di, dj in moves if self.inside(i + di, j + dj))
+                                 for i, j in squares}
+                                for moves in MOVES)
+        self.jump_moves = {(i, j): tuple(((i + di, j + dj), (i + di//2, j + dj//2),
+                                          ((i + di, j + dj), (i, j), (i + di//2, j + dj//2)))
+                                         for di, dj in TAKES if self.inside(i + di, j + dj))
+                           for i, j in squares}
+        # pawn_keys[player][i, j] : bit d'un pion du joueur player en (i, j) dans la clé d'une position (voir
+        # BitState.key) ; la clé d'une position jouée se déduit de la précédente par quelques ou exclusifs
+        # (clés de Zobrist sans collision : chaque pion a son propre bit)
+        self.pawn_keys = tuple({(i, j): 1 << (i * width + j + shift) for i, j in squares}
+                               for shift in (self.black_shift, 1))
+        # réduction par symétrie : active dès que la taille du damier en admet une d'utile
+        self.symmetries = Symmetries(width, height)
+        self.reduce = bool(self.symmetries)
+
+    def __reduce__(self):
+        # un seul objet Geometry par taille de damier, y compris après un pickle
+        return geometry, (self.width, self.height)
+
+    def inside(self, i, j):
+        return 0 <= i < self.height and 0 <= j < self.width
+
+    def shift(self, di, dj):
+        """(gauche, droite, masque) du déplacement (di, dj), ou du pion pris d'une prise (di, dj)"""
+        step_i, step_j = (di // 2, dj // 2) if (di, dj) in TAKES else (di, dj)
+        offset = step_i * self.width + step_j
+        mask = self.to_bits((i, j) for i in range(self.height) for j in range(self.width)
+                            if self.inside(i + di, j + dj))
+        return max(offset, 0), max(-offset, 0), mask
+
+    def canonical(self, key):
+        """clé canonique de la position key si la réduction par symétrie est active"""
+        return self.symmetries.canonical(key) if self.reduce else key
+
+    def bit(self, i, j):
+        return 1 << (i * self.width + j)
+
+    def square(self, bit):
+        """coordonnées (i, j) de la case d'un bit isolé"""
+        return divmod(bit.bit_length() - 1, self.width)
+
+    def to_bits(self, positions):
+        bits = 0
+        for i, j in positions:
+            bits |= self.bit(i, j)
+        return bits
+
+    def to_positions(self, bits):
+        positions = set()
+        while bits:
+            low = bits & -bits
+            positions.add(self.square(low))
+            bits ^= low
+        return frozenset(positions)
+
+
+@cache
+def geometry(width, height):
+    return Geometry(width, height)
+
+
+@dataclass(frozen=True, slots=True)
+class BitState:
+    """Un état du jeu d'alquerkonane, réduit à un seul entier packed (la clé de la position, voir key) :
+    pions noirs puis pions blancs, un bit par case, puis un bit pour le joueur courant (0, 1).
+    Les dimensions du damier et les masques sont dans geo, partagé par tous les états de même taille.
+    L'interface get_moves / new_state / winner est celle de GameState (coups sous forme de triplets de coordonnées),
+    moves / play en sont les équivalents internes où un coup est un triplet de bits (départ, arrivée, pion pris ou 0).
+    count_moves / has_moves répondent sans construire la liste des coups
+    """
+
+    geo: Geometry
+    packed: int
+
+    @classmethod
+    def create(cls, width, height, black, white, player):
+        """construit un état à partir des ensembles de coordonnées des pions"""
+        geo = geometry(width, height)
+        return cls(geo, (geo.to_bits(black) << geo.size | geo.to_bits(white)) << 1 | player)
+
+    @classmethod
+    def initial(cls, width, height, lines, player):
+        black, white = start_position(width, height, lines)
+        return cls.create(width, height, black, white, player)
+
+    @classmethod
+    def from_key(cls, geo, key):
+        """état de clé key (voir key) sur le damier geo"""
+        return cls(geo, key)
+
+    @property
+    def player(self):
+        return self.packed & 1
+
+    @property
+    def black_bits(self):
+        return self.packed >> self.geo.black_shift
+
+    @property
+    def white_bits(self):
+        return self.packed >> 1 & self.geo.full
+
+    @property
+    def width(self):
+        return self.geo.width
+
+    @property
+    def height(self):
+        return self.geo.height
+
+    @property
+    def black(self):
+        return self.geo.to_positions(self.black_bits)
+
+    @property
+    def white(self):
+        return self.geo.to_positions(self.white_bits)
+
+    def pawns(self):
+        """couple (pions du joueur courant, pions adverses)"""
+        packed, geo = self.packed, self.geo
+        if packed & 1 == BLACK:
+            return packed >> geo.black_shift, packed >> 1 & geo.full
+        return packed >> 1 & geo.full, packed >> geo.black_shift
+
+    def moves(self):
+        """renvoie la liste des coups possibles sous forme de triplets de bits (départ, arrivée, pion pris ou 0)"""
+        geo = self.geo
+        pawns, ennemies = self.pawns()
+        steps, jumps = geo.steps[self.packed & 1], geo.jumps
+        occupied = pawns | ennemies
+        possible_moves = []
+        while pawns:
+            low = pawns & -pawns
+            pawns ^= low
+            s = low.bit_length() - 1
+            # déplacements possibles
+            for target in steps[s]:
+                if not occupied & target:
+                    possible_moves.append((low, target, 0))
+            # prises possibles
+            for target, taken in jumps[s]:
+                if ennemies & taken and not occupied & target:
+                    possible_moves.append((low, target, taken))
+        return possible_moves
+
+    def count_moves(self):
+        """nombre de coups possibles, sans les construire"""
+        geo = self.geo
+        pawns, ennemies = self.pawns()
+        empty = ~(pawns | ennemies) & geo.full
+        count = 0
+        for left, right, mask in geo.step_shifts[self.packed & 1]:
+            count += (((pawns & mask) << left >> right) & empty).bit_count()
+        for left, right, mask in geo.jump_shifts:
+            count += (((((pawns & mask) << left >> right) & ennemies) << left >> right) & empty).bit_count()
+        return count
+
+    def has_moves(self):
+        """le joueur courant a-t-il un coup possible ?"""
+        geo = self.geo
+        pawns, ennemies = self.pawns()
+        empty = ~(pawns | ennemies) & geo.full
+        for left, right, mask in geo.step_shifts[self.packed & 1]:
+            if ((pawns & mask) << left >> right) & empty:
+                return True
+        for left, right, mask in geo.jump_shifts:
+            if ((((pawns & mask) << left >> right) & ennemies) << left >> right) & empty:
+                return True
+        return False
+
+    def play(self, move):
+        """nouvel état après le coup interne move"""
+        start, end, taken = move
+        geo, packed = self.geo, self.packed
+        # le pion joué change de case, le pion pris disparaît et le joueur courant change : trois xor
+        if packed & 1 == BLACK:
+            return BitState(geo, packed ^ (start ^ end) << geo.black_shift ^ taken << 1 ^ 1)
+        return BitState(geo, packed ^ (start ^ end) << 1 ^ taken << geo.black_shift ^ 1)
+
+    def get_moves(self):
+        """renvoie l'ensemble des coups possibles sous la même forme que GameState.get_moves"""
+        square = self.geo.square
+        return {(square(end), square(start), square(taken) if taken else None) for start, end, taken in self.moves()}
+
+    def get_moves_from(self, i, j):
+        """renvoie l'ensemble des coups possibles pour le pion en i, j sous la même forme que get_moves"""
+        return {move for move in self.get_moves() if move[1] == (i, j)}
+
+    def coordinates(self, move):
+        """coup interne move (voir moves) sous la forme de get_moves"""
+        start, end, taken = move
+        square = self.geo.square
+        return square(end), square(start), square(taken) if taken else None
+
+    def new_state(self, move):
+        ''' Génération d'un nouvel état du jeu en jouant un coup donné en coordonnées'''
+        new_position, pawn_1, pawn_2 = move
+        bit = self.geo.bit
+        return self.play((bit(*pawn_1), bit(*new_position), bit(*pawn_2) if pawn_2 is not None else 0))
+
+    def key(self):
+        """entier compact identifiant la position : pions noirs, pions blancs puis le joueur courant"""
+        return self.packed
+
+    def winner(self):
+        """gagnant de la position, calculé sans récursion (voir alquer/solver.py)"""
+        return solver.winner(self)
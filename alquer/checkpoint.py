@@ -0,0 +1,93 @@
+"""
+Sauvegardes périodiques d'une longue résolution, pour la reprendre après un arrêt
+
+Une sauvegarde ajoute les positions résolues de la table de transposition à un fichier au format de
+alquer/database.py (écrit à côté puis renommé : un arrêt pendant l'écriture laisse la sauvegarde précédente) ;
+les positions déjà sauvegardées que la table a oubliées restent dans le fichier. Le fichier est ensuite la base
+(database) du solveur : il n'est pas recopié dans la table, dont la taille est bornée, mais consulté avec mmap
+quand la table ne sait pas.
+
+Pour la recherche en profondeur (alquer/solver.py), le fichier path.search (JSON) garde en plus l'état de l'ordre
+des coups (coups meurtriers, historique) et la ligne en cours depuis la racine avec l'ordre des coups restant à
+essayer : la reprise redescend cette ligne et continue dans le même ordre, au lieu de partir d'un ordre vide qui
+mènerait la recherche ailleurs.
+
+L'écriture relit tout le fichier : l'intervalle entre deux sauvegardes grandit avec leur durée pour que les
+sauvegardes prennent au plus MAX_SHARE du temps de calcul.
+"""
+
+import json
+import os
+from time import perf_counter
+
+from .database import Database, save
+from .solver import Interrupted
+
+# secondes entre deux sauvegardes, au moins
+CHECKPOINT_DELAY = 60.0
+# part maximale du temps de calcul passée à sauvegarder
+MAX_SHARE = 0.05
+
+
+class Checkpoint:
+    """Suivi (progress, voir alquer.solver.Solver) qui sauvegarde les positions résolues dans path ; le fichier
+    tient lieu de base (database) du solveur
+    """
+
+    def __init__(self, path, width, height, interval=CHECKPOINT_DELAY):
+        self.path = path
+        self.search_path = f'{path}.search'
+        self.width = width
+        self.height = height
+        self.interval = interval
+        self.stopping = False
+        self.saves = 0
+        self.cost = 0.0
+        self.next = perf_counter() + interval
+
+    def resume(self, search):
+        """reprend la dernière sauvegarde, s'il y en a une : le fichier devient la base de search et, pour la
+        recherche en profondeur, l'ordre des coups et la ligne en cours sont repris ; renvoie son nombre de positions
+        """
+        if not os.path.exists(self.path):
+            return 0
+        database = Database(self.path)
+        if (database.width, database.height) != (self.width, self.height):
+            database.close()
+            raise ValueError(f'{self.path} contient des positions {database.width}x{database.height}')
+        search.database = database
+        if getattr(search, 'ordering', None) is not None and os.path.exists(self.search_path):
+            with open(self.search_path) as file:
+                state = json.load(file)
+            search.resume(state['ordering'], [(key, [tuple(m) for m in moves]) for key, moves in state['line']])
+        return len(database)
+
+    def stop(self):
+        """demande l'arrêt de la recherche, sans danger depuis un gestionnaire de signal : Interrupted est levée au
+        prochain appel du suivi, entre deux positions, jamais pendant une écriture dans la table
+        """
+        self.stopping = True
+
+    def __call__(self, search):
+        if self.stopping:
+            raise Interrupted
+        if perf_counter() >= self.next:
+            self.save(search)
+
+    def save(self, search):
+        """sauvegarde immédiate ; renvoie le nombre de positions du fichier"""
+        t_start = perf_counter()
+        # le fichier ouvert comme base de search est fermé par l'écriture, puis rouvert complété
+        database = search.database if search.database is not None and search.database.path == self.path else None
+        count = save(self.path, self.width, self.height, search.table, database)
+        search.database = Database(self.path)
+        if getattr(search, 'ordering', None) is not None:
+            temporary = f'{self.search_path}.tmp'
+            with open(temporary, 'w') as file:
+                json.dump({'ordering': search.ordering.state(), 'line': search.line()}, file)
+            os.replace(temporary, self.search_path)
+        cost = perf_counter() - t_start
+        self.saves += 1
+        self.cost += cost
+        self.next = perf_counter() + max(self.interval, cost / MAX_SHARE)
+        return count
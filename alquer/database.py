@@ -0,0 +1,122 @@
+"""
+Base de positions résolues sur disque
+
+Le fichier contient un en-tête (taille du damier, nombre d'entrées) puis les entrées triées, chacune sur un
+nombre fixe d'octets : la clé canonique de la position (voir BitState.key) décalée d'un bit, ce dernier bit
+valant 1 si le joueur courant gagne. Le fichier est ouvert avec mmap : une recherche est une dichotomie sur les
+entrées, d'abord sur un index d'une clé toutes les INDEX_STEP entrées gardé en mémoire, puis dans le fichier ;
+seules les pages lues sont chargées en mémoire.
+"""
+
+import mmap
+import os
+import struct
+from bisect import bisect_right
+from heapq import merge
+
+MAGIC = b'ALQDB1'
+# marque, largeur, hauteur, nombre d'entrées
+HEADER = struct.Struct('<6sBBQ')
+# entrées entre deux clés de l'index gardé en mémoire
+INDEX_STEP = 32
+
+
+def entry_bytes(width, height):
+    """place d'une entrée : la clé (2 bits par case et le joueur courant) et le bit de résultat"""
+    return (2 * width * height + 2 + 7) // 8
+
+
+class Database:
+    """Positions résolues d'un fichier, en lecture seule ; get a la même interface que TranspositionTable.get"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.width, self.height, self.count = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} n'est pas un fichier de positions résolues")
+        self.entry_bytes = entry_bytes(self.width, self.height)
+        # une clé toutes les INDEX_STEP entrées : la dichotomie se fait surtout en mémoire (bisect)
+        self.index = [self.entry(index) >> 1 for index in range(0, self.count, INDEX_STEP)]
+        self.hits = self.misses = 0
+
+    def entry(self, index):
+        start = HEADER.size + index * self.entry_bytes
+        return int.from_bytes(self.map[start:start + self.entry_bytes], 'big')
+
+    def get(self, key):
+        """renvoie 1 si le joueur courant de la position key gagne, 0 s'il perd, None si elle est absente"""
+        block = bisect_right(self.index, key) - 1
+        if block < 0:
+            self.misses += 1
+            return None
+        low = block * INDEX_STEP
+        high = min(low + INDEX_STEP, self.count)
+        while low < high:
+            middle = (low + high) // 2
+            entry = self.entry(middle)
+            if entry >> 1 == key:
+                self.hits += 1
+                return entry & 1
+            if entry >> 1 < key:
+                low = middle + 1
+            else:
+                high = middle
+        self.misses += 1
+        return None
+
+    def items(self):
+        """itérateur sur les couples (clé, valeur) dans l'ordre des clés"""
+        for index in range(self.count):
+            entry = self.entry(index)
+            yield entry >> 1, entry & 1
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+def write(path, width, height, items):
+    """écrit le fichier path à partir des couples (clé, valeur) triés par clé, sans doublon"""
+    size = entry_bytes(width, height)
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, width, height, 0))
+        count = 0
+        for key, wins in items:
+            file.write((key << 1 | wins).to_bytes(size, 'big'))
+            count += 1
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, width, height, count))
+    return count
+
+
+def save(path, width, height, table, database=None):
+    """ajoute au fichier path les positions de la table de transposition ;
+    database est le fichier déjà ouvert sur path s'il y en a un, il est fermé par l'écriture
+    """
+    if database is None and os.path.exists(path):
+        database = Database(path)
+    known = database.items() if database is not None else ()
+    solved = sorted((key, wins) for key, wins in table.items())
+
+    def unique(items):
+        previous = None
+        for key, wins in items:
+            if key != previous:
+                yield key, wins
+            previous = key
+
+    temporary = f'{path}.tmp'
+    try:
+        count = write(temporary, width, height, unique(merge(known, solved, key=lambda item: item[0])))
+    finally:
+        if database is not None:
+            database.close()
+    # le fichier n'est remplacé qu'une fois complet
+    os.replace(temporary, path)
+    return count
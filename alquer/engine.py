@@ -0,0 +1,102 @@
+"""
+Moteurs interchangeables, choisis par leur nom : représentation des états, calcul du gagnant, IA
+
+Les deux jeux (alquer_seb.py, alquerkonane_gui.py) et les outils sans interface les prennent ici ; un moteur
+ajouté à l'un des dictionnaires est aussitôt proposé par les options --engine, --solver et --ai.
+
+STATES   classes d'états : create(width, height, black, white, player) et initial(width, height, lines, player) ;
+         un état a l'interface de GameState (get_moves, new_state, winner...) et celle attendue par alquer.solver
+SOLVERS  classes de solveurs, construites avec (table, database), winner(state) ; INSTRUMENTED, leurs versions
+         mesurées (voir alquer/instrument.py)
+AIS      classes d'IA, construites avec (solver, think) ; move(state) renvoie un coup sous la forme de get_moves
+
+board_arguments et normalise_lines donnent aux outils en ligne de commande les mêmes options de damier.
+"""
+
+from .ai import AlphaBeta, best_move
+from .bitboard import BitState
+from .instrument import InstrumentedProofNumberSolver, InstrumentedSolver
+from .pns import ProofNumberSolver
+from .solver import Solver, solver as default_solver
+from .state import GameState
+from .strategy import reply
+
+STATES = {'sets': GameState, 'bits': BitState}
+SOLVERS = {'dfs': Solver, 'pn': ProofNumberSolver}
+INSTRUMENTED = {'dfs': InstrumentedSolver, 'pn': InstrumentedProofNumberSolver}
+
+
+def initial_state(engine, width, height, lines, player):
+    """position de départ d'un damier width x height avec le moteur engine"""
+    return STATES[engine].initial(width, height, lines, player)
+
+
+def normalise_lines(height, lines):
+    """nombre de lignes de pions réellement placées : 1 ou 2, une seule si le damier a au plus deux rangées"""
+    return min(2, max(lines, 1)) if height > 2 else 1
+
+
+def board_arguments(parser, grid=False, width=4, height=4, start=1, memory=256,
+                    memory_help='Taille (en Mo) de la table de transposition'):
+    """ajoute à parser les options du damier -W, -H, -l et, sauf si leur valeur par défaut est None, -s et -m
+    (décrite par memory_help) ; avec grid, chaque option du damier prend plusieurs valeurs (grille de
+    configurations) et ses valeurs par défaut sont des listes
+    """
+    def default(value):
+        return [value] if grid and not isinstance(value, list) else value
+
+    def shown(value):
+        return ' et '.join(map(str, value)) if isinstance(value, list) else value
+
+    board = {'type': int, 'nargs': '+'} if grid else {'type': int}
+    width_help, height_help, lines_help, start_help = (
+        ('Largeurs', 'Hauteurs', 'Nombres', 'Joueurs qui commencent') if grid else
+        ('Largeur', 'Hauteur', 'Nombre', 'Joueur qui commence'))
+    parser.add_argument('-W', '--width', help=f'{width_help} du damier, {shown(width)} par défaut',
+                        default=default(width), **board)
+    parser.add_argument('-H', '--height', help=f'{height_help} du damier, {shown(height)} par défaut',
+                        default=default(height), **board)
+    parser.add_argument('-l', '--lines', help=f'{lines_help} de lignes de pions, 1 ou 2 (par défaut)',
+                        default=default(2), **board)
+    if start is not None:
+        parser.add_argument('-s', '--start', help=f'{start_help} : 0 = Black, 1 = White, {shown(start)} par défaut',
+                            choices=(0, 1), default=default(start), **board)
+    if memory is not None:
+        parser.add_argument('-m', '--memory', help=f'{memory_help}, {memory} par défaut', type=int, default=memory)
+
+
+def new_solver(name='dfs', profile=False):
+    """solveur name, instrumenté avec profile ; la recherche en profondeur sans mesures est le solveur partagé
+    alquer.solver.solver, celui de GameState.winner et BitState.winner
+    """
+    if profile:
+        return INSTRUMENTED[name]()
+    if name == 'dfs':
+        return default_solver
+    return SOLVERS[name]()
+
+
+class ExactAI:
+    """coup gagnant d'après le calcul exact de solver, lu dans la table une fois la position résolue
+    (voir alquer/strategy.py) ; think est sans effet
+    """
+
+    def __init__(self, solver, think=None):
+        self.solver = solver
+
+    def move(self, state):
+        move = reply(self.solver, state)
+        return state.coordinates(move) if isinstance(state, BitState) else move
+
+
+class SearchAI(AlphaBeta):
+    """alpha-bêta en think secondes par coup (voir alquer/ai.py), avec les positions résolues par solver"""
+
+    def __init__(self, solver, think=1.0):
+        super().__init__(think, solver.table, solver.database)
+
+    def move(self, state):
+        return best_move(state, self)
+
+
+AIS = {'exact': ExactAI, 'search': SearchAI}
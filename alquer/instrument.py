@@ -0,0 +1,219 @@
+"""
+Mesures du calcul du gagnant : où passe le temps d'une longue résolution
+python -m alquer.instrument -W 5 -H 5 -l 2 -s 1 [--solver pn] [--sample 5]
+
+InstrumentedSolver et InstrumentedProofNumberSolver sont les solveurs ordinaires dont la racine est enveloppée
+dans un état mesuré (Timed) : ses positions filles le sont aussi, ce qui compte les positions développées, les
+positions terminales, les coups par profondeur, et mesure le temps passé à générer les coups (moves), à jouer
+les coups (play) et à compter les réponses (count_moves, has_moves). Les consultations de la table de
+transposition et de la base sont lues dans leurs compteurs. Un résumé est écrit toutes les --sample secondes
+pendant la recherche, le rapport complet à la fin.
+
+Les solveurs ordinaires ne sont pas modifiés : sans mesures (option --profile du jeu), aucun surcoût.
+Les temps mesurés comprennent le coût des mesures elles-mêmes.
+"""
+
+import argparse
+import sys
+from time import perf_counter
+
+from .bitboard import BitState
+from .pns import ProofNumberSolver
+from .solver import PROGRESS_NODES, Solver
+
+# secondes entre deux résumés pendant la recherche
+SAMPLE_DELAY = 5.0
+
+TIMERS = 'moves', 'play', 'replies'
+
+
+class Profile:
+    """Compteurs cumulés sur toutes les résolutions d'un solveur instrumenté"""
+
+    def __init__(self, sample=SAMPLE_DELAY, output=sys.stderr):
+        self.sample = sample
+        self.output = output
+        self.solves = 0
+        self.elapsed = 0.0
+        self.expanded = self.terminal = 0
+        # positions filles sans réponse, reconnues par count_moves ou has_moves sans être développées
+        self.dead_ends = 0
+        # profondeur -> [positions développées, coups]
+        self.depths = {}
+        self.times = dict.fromkeys(TIMERS, 0.0)
+        self.counters = {}
+
+    def start(self, search):
+        self.search = search
+        self.nodes = search.nodes
+        self.before = self.lookups(search)
+        self.started = self.shown = perf_counter()
+
+    def stop(self):
+        self.solves += 1
+        self.elapsed += perf_counter() - self.started
+        for name, value in self.lookups(self.search).items():
+            self.counters[name] = self.counters.get(name, 0) + value - self.before[name]
+        self.counters['nodes'] = self.counters.get('nodes', 0) + self.search.nodes - self.nodes
+
+    @staticmethod
+    def lookups(search):
+        counters = {'table hits': search.table.hits, 'table misses': search.table.misses}
+        if search.database is not None:
+            counters['database hits'] = search.database.hits
+            counters['database misses'] = search.database.misses
+        return counters
+
+    def expand(self, depth, count):
+        """position développée à la profondeur depth (depuis la racine), avec count coups"""
+        self.expanded += 1
+        if count == 0:
+            self.terminal += 1
+        entry = self.depths.get(depth)
+        if entry is None:
+            entry = self.depths[depth] = [0, 0]
+        entry[0] += 1
+        entry[1] += count
+        if self.expanded % PROGRESS_NODES == 0:
+            now = perf_counter()
+            if now - self.shown >= self.sample:
+                self.shown = now
+                print(self.summary(now), file=self.output, flush=True)
+
+    def summary(self, now):
+        elapsed = now - self.started
+        nodes = self.search.nodes - self.nodes
+        times = ', '.join(f'{name} {self.times[name]:.1f}s' for name in TIMERS)
+        return (f'[{elapsed:.0f}s] {nodes} positions examinées ({nodes / elapsed:.0f}/s), '
+                f'{self.expanded} développées, {self.terminal} terminales ; {times}')
+
+    def report(self):
+        """lignes du rapport des résolutions faites jusqu'ici"""
+        elapsed = self.elapsed or 1e-9
+        nodes = self.counters.get('nodes', 0)
+        lines = [f'{self.solves} résolution(s) en {self.elapsed:.2f}s',
+                 f'positions examinées {nodes:>14} ({nodes / elapsed:.0f}/s)',
+                 f'positions développées {self.expanded:>12}',
+                 f'positions terminales {self.terminal:>13}',
+                 f'filles sans réponse {self.dead_ends:>14}']
+        for source in ('table', 'database'):
+            hits, misses = self.counters.get(f'{source} hits'), self.counters.get(f'{source} misses')
+            if hits is not None:
+                rate = hits / (hits + misses) if hits + misses else 0
+                lines.append(f'{source:<9} {hits:>10} trouvées {misses:>10} absentes ({rate:.1%})')
+        measured = 0.0
+        for name in TIMERS:
+            measured += self.times[name]
+            lines.append(f'temps {name:<8} {self.times[name]:>9.2f}s ({self.times[name] / elapsed:.1%})')
+        rest = max(0.0, self.elapsed - measured)
+        lines.append(f'temps {"reste":<8} {rest:>9.2f}s ({rest / elapsed:.1%})')
+        lines.append(f'{"profondeur":>10}{"développées":>14}{"coups":>8}')
+        for depth in sorted(self.depths):
+            expanded, moves = self.depths[depth]
+            lines.append(f'{depth:>10}{expanded:>14}{moves / expanded:>8.2f}')
+        return lines
+
+
+class Timed:
+    """État mesuré : enveloppe state (même interface que pour alquer.solver) et note dans profile le temps
+    de ses appels ; depth est sa profondeur depuis la racine de la résolution
+    """
+
+    __slots__ = ('state', 'profile', 'depth')
+
+    def __init__(self, state, profile, depth=0):
+        self.state = state
+        self.profile = profile
+        self.depth = depth
+
+    @property
+    def player(self):
+        return self.state.player
+
+    @property
+    def width(self):
+        return self.state.width
+
+    @property
+    def height(self):
+        return self.state.height
+
+    def key(self):
+        return self.state.key()
+
+    def moves(self):
+        t_start = perf_counter()
+        moves = self.state.moves()
+        self.profile.times['moves'] += perf_counter() - t_start
+        self.profile.expand(self.depth, len(moves))
+        return moves
+
+    def play(self, move):
+        t_start = perf_counter()
+        child = self.state.play(move)
+        self.profile.times['play'] += perf_counter() - t_start
+        return Timed(child, self.profile, self.depth + 1)
+
+    def count_moves(self):
+        t_start = perf_counter()
+        count = self.state.count_moves()
+        self.profile.times['replies'] += perf_counter() - t_start
+        if count == 0:
+            self.profile.dead_ends += 1
+        return count
+
+    def has_moves(self):
+        t_start = perf_counter()
+        found = self.state.has_moves()
+        self.profile.times['replies'] += perf_counter() - t_start
+        if not found:
+            self.profile.dead_ends += 1
+        return found
+
+
+class Instrumented:
+    """Partie commune des solveurs instrumentés : profile cumule les mesures de leurs résolutions"""
+
+    def solve(self, root):
+        self.profile.start(self)
+        try:
+            return super().solve(Timed(root, self.profile))
+        finally:
+            self.profile.stop()
+
+
+class InstrumentedSolver(Instrumented, Solver):
+
+    def __init__(self, *args, profile=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profile = profile or Profile()
+
+
+class InstrumentedProofNumberSolver(Instrumented, ProofNumberSolver):
+
+    def __init__(self, *args, profile=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profile = profile or Profile()
+
+
+def main():
+    # alquer.engine importe ce module
+    from .engine import board_arguments, normalise_lines
+
+    parser = argparse.ArgumentParser(description="mesures du calcul du gagnant d'une configuration")
+    board_arguments(parser, memory=None)
+    parser.add_argument('--solver', help='dfs (par défaut) ou pn', choices=('dfs', 'pn'), default='dfs')
+    parser.add_argument('--sample', help='Secondes entre deux résumés, 5 par défaut', type=float,
+                        default=SAMPLE_DELAY)
+    args = parser.parse_args()
+    lines = normalise_lines(args.height, args.lines)
+
+    profile = Profile(args.sample)
+    solver = (InstrumentedProofNumberSolver if args.solver == 'pn' else InstrumentedSolver)(profile=profile)
+    winner = solver.winner(BitState.initial(args.width, args.height, lines, args.start))
+    print(f"{args.width}x{args.height}/{lines} : gagnant {('black', 'white')[winner]}")
+    print('\n'.join(profile.report()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Ordre d'examen des coups pour la recherche du gagnant
+
+Les coups sont essayés dans un ordre déterministe : les prises d'abord, puis les coups meurtriers (killer moves :
+les derniers coups gagnants trouvés à la même profondeur), puis selon l'historique (nombre de fois où le coup,
+repéré par ses cases de départ et d'arrivée, a été gagnant), enfin ceux qui laissent le moins de réponses à
+l'adversaire. À égalité, l'ordre de la liste des coups est conservé.
+
+Un coup est un triplet dont le dernier élément est le pion pris (0 ou None pour un simple déplacement) :
+c'est le cas des coups de BitState comme de ceux de GameState.
+"""
+
+KILLERS = 2
+
+
+class MoveOrdering:
+    """Coups meurtriers par profondeur et historique des coups gagnants"""
+
+    def __init__(self, killers=KILLERS):
+        self.slots = killers
+        self.clear()
+
+    def clear(self):
+        self.killers = []
+        self.history = {}
+
+    def state(self):
+        """coups meurtriers et historique, sous une forme que json sait écrire (voir restore)"""
+        return {'killers': self.killers, 'history': list(self.history.items())}
+
+    def restore(self, state):
+        """reprend les coups meurtriers et l'historique donnés par state()"""
+        self.killers = [[tuple(move) for move in killers] for killers in state['killers']]
+        self.history = {tuple(move): count for move, count in state['history']}
+
+    def order(self, moves, depth, replies):
+        """renvoie la liste des coups moves triée, replies[k] étant le nombre de réponses au coup moves[k]"""
+        killers = self.killers[depth] if depth < len(self.killers) else ()
+        history = self.history
+        ranked = sorted(zip(moves, replies),
+                        key=lambda item: (not item[0][2], item[0] not in killers, -history.get(item[0], 0), item[1]))
+        return [move for move, _ in ranked]
+
+    def success(self, move, depth):
+        """move s'est révélé gagnant à la profondeur depth"""
+        while len(self.killers) <= depth:
+            self.killers.append([])
+        killers = self.killers[depth]
+        if move in killers:
+            killers.remove(move)
+        killers.insert(0, move)
+        del killers[self.slots:]
+        self.history[move] = self.history.get(move, 0) + 1
+
+
+ordering = MoveOrdering()
@@ -0,0 +1,152 @@
+"""
+Calcul du gagnant réparti sur plusieurs processus
+
+Les positions atteintes après split_depth coups depuis la racine sont résolues en parallèle par un
+ProcessPoolExecutor, chaque processus ayant sa propre table de transposition, ou tous une même table en
+mémoire partagée (shared, voir alquer/shared.py) pour ne pas résoudre chacun les positions communes à
+plusieurs feuilles. Les résultats remontent
+dans l'arbre des premiers coups : dès qu'un coup gagnant est trouvé pour le joueur d'un noeud,
+les positions restantes sous ce noeud ne sont plus soumises, et les processus sont arrêtés dès que
+la racine est résolue, ou le calcul abandonné (cancel).
+"""
+
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .bitboard import geometry
+from .database import Database
+from .shared import SharedTable
+from .solver import solver
+from .transposition import table
+
+# secondes entre deux appels de cancel pendant l'attente des processus
+POLL_DELAY = 0.1
+
+
+class Node:
+    """Noeud de l'arbre des premiers coups ; wins vaut None tant que le noeud n'est pas résolu,
+    sinon True si son joueur courant gagne
+    """
+
+    def __init__(self, state):
+        self.state = state
+        self.parents = []
+        self.children = []
+        self.pending = 0
+        self.wins = None
+
+    def resolve(self, wins):
+        """fixe le résultat du noeud et le fait remonter à ses parents"""
+        if self.wins is not None:
+            return
+        self.wins = wins
+        for parent in self.parents:
+            if parent.wins is not None:
+                continue
+            if not wins:
+                # le joueur du parent a un coup qui fait perdre son adversaire
+                parent.resolve(True)
+            else:
+                parent.pending -= 1
+                if parent.pending == 0:
+                    parent.resolve(False)
+
+    def needed(self):
+        """le résultat du noeud sert-il encore à résoudre la racine ?"""
+        if self.wins is not None:
+            return False
+        return not self.parents or any(parent.needed() for parent in self.parents)
+
+
+def split(state, depth, nodes):
+    """construit l'arbre des coups jusqu'à la profondeur depth ;
+    nodes associe une clé canonique de position à son noeud pour ne résoudre qu'une fois chaque position
+    """
+    key = geometry(state.width, state.height).canonical(state.key())
+    if key in nodes:
+        return nodes[key]
+    node = nodes[key] = Node(state)
+    moves = state.get_moves()
+    if len(moves) == 0:
+        node.wins = False
+        return node
+    if depth == 0:
+        return node
+    for move in moves:
+        child = split(state.new_state(move), depth - 1, nodes)
+        if child.wins is False:
+            # coup gagnant immédiat
+            node.children = []
+            node.wins = True
+            return node
+        if child.wins is None and node not in child.parents:
+            child.parents.append(node)
+            node.children.append(child)
+    node.pending = len(node.children)
+    if node.pending == 0:
+        node.wins = False
+    return node
+
+
+def init_worker(max_bytes, database_path, shared_table=None):
+    # le suivi posé sur le solveur par le processus parent (la fenêtre de alquer_seb.py) n'a pas de sens ici
+    solver.progress = None
+    if shared_table is not None:
+        solver.table = shared_table
+    else:
+        table.resize(max_bytes)
+    solver.database = Database(database_path) if database_path else None
+
+
+def solve(state):
+    return state.winner() == state.player
+
+
+def parallel_winner(state, jobs, split_depth=1, max_bytes=None, shared=False, cancel=None):
+    """renvoie le gagnant de la position state avec jobs processus,
+    max_bytes est le budget mémoire de la table de transposition de chaque processus, ou de la table partagée
+    par tous si shared ; cancel, s'il n'est pas None, est appelé toutes les POLL_DELAY secondes pendant le calcul
+    et lève Interrupted (voir alquer.solver) pour l'abandonner
+    """
+    nodes = {}
+    root = split(state, split_depth, nodes)
+    if root.wins is not None:
+        return state.player if root.wins else 1 - state.player
+    leaves = [node for node in nodes.values() if not node.children and node.needed()]
+
+    database_path = solver.database.path if solver.database is not None else None
+    max_bytes = max_bytes or table.max_bytes
+    shared_table = SharedTable(state.width, state.height, max_bytes) if shared else None
+    executor = ProcessPoolExecutor(max_workers=jobs, initializer=init_worker,
+                                   initargs=(max_bytes, database_path, shared_table))
+    try:
+        # jamais plus de jobs calculs soumis : une feuille devenue inutile n'est simplement pas soumise
+        leaves.reverse()
+        running = {}
+        while root.wins is None:
+            while leaves and len(running) < jobs:
+                leaf = leaves.pop()
+                if leaf.needed():
+                    running[executor.submit(solve, leaf.state)] = leaf
+            done, _ = wait(running, timeout=POLL_DELAY if cancel is not None else None,
+                           return_when=FIRST_COMPLETED)
+            if cancel is not None:
+                cancel()
+            for future in done:
+                running.pop(future).resolve(future.result())
+    finally:
+        # les calculs en cours ne peuvent pas être annulés : on arrête les processus. ProcessPoolExecutor ne les
+        # expose pas : _processes (pid -> processus) est un attribut privé, lu exprès ; s'il disparaît, shutdown
+        # laisse seulement finir les calculs déjà lancés
+        processes = list((getattr(executor, '_processes', None) or {}).values())
+        executor.shutdown(wait=False)
+        for process in processes:
+            process.terminate()
+        if shared_table is not None:
+            for process in processes:
+                process.join()
+            shared_table.unlink()
+    # les positions résolues de l'arbre des premiers coups servent ensuite à l'IA et à la base sur disque
+    for key, node in nodes.items():
+        if node.wins is not None:
+            table.store(key, node.wins, (key >> 1).bit_count())
+    return state.player if root.wins else 1 - state.player
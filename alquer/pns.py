@@ -0,0 +1,92 @@
+"""
+Recherche par nombres de preuve (df-pn), autre moyen de calculer le gagnant
+
+Chaque position a deux nombres : proof, le nombre minimal de positions à résoudre pour prouver que son joueur
+courant gagne, et disproof, pour prouver qu'il perd. Pour une position, proof est le plus petit disproof de ses
+positions filles et disproof la somme de leurs proof. La recherche descend toujours vers la position fille de
+plus petit disproof, tant que les nombres de la position restent sous les seuils fixés par sa mère : les coups
+qui réfutent vite sont examinés en premier, là où la recherche en profondeur suit l'ordre des coups.
+Comme pour alquer.solver, une position gagnante est rangée avec la clé de sa position fille perdante.
+
+La profondeur de récursion est celle d'une partie (un coup avance un pion ou en prend un).
+Un état doit fournir la même interface que pour alquer.solver.
+"""
+
+from . import bitboard
+from .solver import PROGRESS_NODES
+from .transposition import table as default_table
+
+INFINITY = 2**62
+
+
+class ProofNumberSolver:
+    """Calcul du gagnant par df-pn ; les positions résolues sont partagées avec table (et database, voir
+    alquer/database.py), nodes compte les positions développées ; progress comme pour alquer.solver.Solver
+    """
+
+    def __init__(self, table=default_table, database=None):
+        self.table = table
+        self.database = database
+        self.progress = None
+        self.nodes = 0
+
+    def winner(self, state):
+        return state.player if self.solve(state) else 1 - state.player
+
+    def solve(self, root):
+        """renvoie True si le joueur courant de root gagne"""
+        self.geo = bitboard.geometry(root.width, root.height)
+        # nombres des positions non résolues, le temps de la recherche
+        self.numbers = {}
+        key = self.geo.canonical(root.key())
+        self.search(root, key, INFINITY, INFINITY)
+        self.numbers = {}
+        return bool(self.table.get(key))
+
+    def lookup(self, key):
+        """(proof, disproof) de la position key, (1, 1) si elle n'a pas encore été vue"""
+        wins = self.table.get(key)
+        if wins is None and self.database is not None:
+            wins = self.database.get(key)
+        if wins is not None:
+            return (0, INFINITY) if wins else (INFINITY, 0)
+        return self.numbers.get(key, (1, 1))
+
+    def store(self, key, proof, disproof, best=None):
+        if proof == 0 or disproof == 0:
+            self.numbers.pop(key, None)
+            self.table.store(key, proof == 0, (key >> 1).bit_count(), best)
+        else:
+            self.numbers[key] = proof, disproof
+
+    def search(self, state, key, proof_threshold, disproof_threshold):
+        """développe state jusqu'à ce que ses nombres atteignent l'un des seuils"""
+        self.nodes += 1
+        if self.progress is not None and self.nodes % PROGRESS_NODES == 0:
+            self.progress(self)
+        moves = state.moves()
+        if len(moves) == 0:
+            self.store(key, INFINITY, 0)
+            return
+        canonical = self.geo.canonical
+        children = {}
+        for m in moves:
+            child = state.play(m)
+            # deux coups symétriques mènent à la même position canonique : elle n'est comptée qu'une fois
+            children.setdefault(canonical(child.key()), child)
+        while True:
+            numbers = [(self.lookup(child_key), child_key) for child_key in children]
+            proof = min(child_disproof for (_, child_disproof), _ in numbers)
+            disproof = min(INFINITY, sum(child_proof for (child_proof, _), _ in numbers))
+            if proof >= proof_threshold or disproof >= disproof_threshold:
+                # position gagnante : une position fille est prouvée perdante
+                best = next(child_key for (_, child_disproof), child_key in numbers if child_disproof == 0) \
+                    if proof == 0 else None
+                self.store(key, proof, disproof, best)
+                return
+            numbers.sort(key=lambda item: item[0][1])
+            (child_proof, child_disproof), child_key = numbers[0]
+            second = numbers[1][0][1] if len(numbers) > 1 else INFINITY
+            self.search(children[child_key], child_key,
+                        min(INFINITY, disproof_threshold - disproof + child_proof),
+                        min(proof_threshold, second + 1))
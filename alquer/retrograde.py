@@ -0,0 +1,94 @@
+"""
+Table complète des positions d'un damier par analyse rétrograde
+python -m alquer.retrograde -W 5 -H 5 -l 2 -o 5x5.db
+
+Toutes les positions atteignables depuis le début de partie (quel que soit le joueur qui commence) sont
+énumérées, sous forme de clés canoniques, puis rangées par ordre croissant et indexées par leur rang.
+Un coup fait soit avancer un pion d'une ligne, soit disparaître un pion : en classant les positions par nombre
+de pions croissant puis avancement total décroissant, les positions filles d'une position sont toujours
+classées avant elle. Les positions sont donc résolues couche par couche en partant des positions terminales
+(aucun coup pour le joueur courant, qui perd), sans recherche ni récursion.
+
+La table est écrite au format de alquer/database.py : l'option --database du jeu la consulte directement.
+"""
+
+import argparse
+from bisect import bisect_left
+from time import perf_counter
+
+from .bitboard import BitState, geometry
+from .database import write
+from .engine import board_arguments, normalise_lines
+
+
+def layer(geo, key):
+    """couche de la position key : nombre de pions et avancement total, les positions filles sont dans des
+    couches plus petites (moins de pions, ou autant et plus avancées)
+    """
+    size = geo.size
+    black = key >> (size + 1)
+    white = key >> 1 & (1 << size) - 1
+    row = (1 << geo.width) - 1
+    advance = 0
+    for i in range(geo.height):
+        mask = row << (i * geo.width)
+        advance += i * (black & mask).bit_count() + (geo.height - 1 - i) * (white & mask).bit_count()
+    return black.bit_count() + white.bit_count(), -advance
+
+
+def reachable(width, height, lines):
+    """liste triée des clés canoniques des positions atteignables depuis le début de partie"""
+    geo = geometry(width, height)
+    seen = set()
+    frontier = []
+    for player in (0, 1):
+        key = geo.canonical(BitState.initial(width, height, lines, player).key())
+        if key not in seen:
+            seen.add(key)
+            frontier.append(key)
+    while frontier:
+        state = BitState.from_key(geo, frontier.pop())
+        for move in state.moves():
+            key = geo.canonical(state.play(move).key())
+            if key not in seen:
+                seen.add(key)
+                frontier.append(key)
+    return sorted(seen)
+
+
+def solve(width, height, keys):
+    """renvoie le bytearray des résultats (1 si le joueur courant gagne) des positions keys, triées"""
+    geo = geometry(width, height)
+    values = bytearray(len(keys))
+    order = sorted(range(len(keys)), key=lambda index: layer(geo, keys[index]))
+    for index in order:
+        state = BitState.from_key(geo, keys[index])
+        for move in state.moves():
+            child = geo.canonical(state.play(move).key())
+            if values[bisect_left(keys, child)] == 0:
+                # la position fille, déjà résolue, est perdante pour son joueur
+                values[index] = 1
+                break
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description="table complète des positions d'un damier")
+    board_arguments(parser, start=None, memory=None)
+    parser.add_argument('-o', '--output', help='Fichier de la table, WxH-l.db par défaut')
+    args = parser.parse_args()
+    lines = normalise_lines(args.height, args.lines)
+    output = args.output or f'{args.width}x{args.height}-{lines}.db'
+
+    t_start = perf_counter()
+    keys = reachable(args.width, args.height, lines)
+    print(f'{len(keys)} positions atteignables en {perf_counter() - t_start:.1f}s')
+    t_start = perf_counter()
+    values = solve(args.width, args.height, keys)
+    print(f'{sum(values)} positions gagnantes pour le joueur courant, calcul en {perf_counter() - t_start:.1f}s')
+    write(output, args.width, args.height, zip(keys, values))
+    print(f'table écrite dans {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+"""
+Règles du jeu d'alquerkonane, indépendantes de l'interface graphique
+La case en haut et à gauche est (0, 0) : indice de ligne puis indice de colonne
+"""
+
+BLACK = 0
+WHITE = 1
+
+# Tuples d'infos... noir toujours en indice 0
+#
+BLACK_MOVES = (1, -1), (1, 1)
+WHITE_MOVES = (-1, -1), (-1, 1)
+
+MOVES = BLACK_MOVES, WHITE_MOVES
+TAKES = (0, 2), (0, -2), (2, 0), (-2, 0)
+
+
+def start_position(width, height, lines):
+    """renvoie le couple des ensembles des coordonnées des pions noirs et blancs en début de partie"""
+    if height % 2 == 0:
+        white = {(height-i-1, j + i%2) for j in range(0, width, 2) for i in range(lines) if width > j + i%2}
+        black = {(i, j + i%2) for j in range(0, width, 2) for i in range(lines) if width > j + i%2}
+    else:
+        white = {(height-i-1, j + i%2 - 1) for j in range(0, width+1, 2) for i in range(lines) if width > j + i%2 - 1 >= 0}
+        black = {(i, j + i%2) for j in range(0, width, 2) for i in range(lines) if width > j + i%2 >= 0}
+    return frozenset(black), frozenset(white)
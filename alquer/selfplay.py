@@ -0,0 +1,224 @@
+"""
+Parties de l'IA contre elle-même, sans interface graphique : force et temps de réponse des différentes IA
+python -m alquer.selfplay -W 4 5 -H 4 5 -l 2 -p exact search:0.05 depth:2 random -g 100 [-o games.jsonl]
+
+Chaque joueur est décrit par une chaîne :
+    exact           premier coup gagnant d'après le calcul exact du gagnant (l'IA par défaut du jeu)
+    search:T        alpha-bêta par approfondissement itératif en T secondes par coup (option --ai search du jeu)
+    depth:N         le même, limité à N coups de profondeur et sans limite de temps
+    random          coup au hasard
+
+Pour chaque damier, chaque paire de joueurs différents dispute --games parties de chaque couleur, en
+alternant le joueur qui commence ; les --opening premiers coups sont tirés au hasard pour varier les parties.
+Les parties sont réparties sur --jobs processus, chacun gardant ses joueurs (et leurs tables) d'une partie
+à l'autre. Chaque partie est écrite dans --output (JSON Lines) avec, pour chaque camp, le temps et le nombre
+de positions examinées de chaque coup ; le résumé (victoires, longueur des parties, temps par coup moyen et
+centiles, positions par coup, débit) est affiché à la fin.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+from itertools import permutations
+from multiprocessing import Pool
+from time import perf_counter
+
+from .ai import MAX_DEPTH, AlphaBeta
+from .bitboard import BitState
+from .engine import board_arguments, normalise_lines
+from .rules import BLACK, WHITE
+from .solver import Solver
+from .strategy import reply
+from .transposition import TranspositionTable
+
+COLORS = 'black', 'white'
+
+
+class ExactPlayer:
+    """coup gagnant d'après le calcul exact, comme ExactAI (alquer/engine.py), l'IA par défaut du jeu"""
+
+    def __init__(self, max_bytes):
+        self.solver = Solver(TranspositionTable(max_bytes))
+        self.nodes = 0
+
+    def move(self, state):
+        nodes = self.solver.nodes
+        # coup gagnant lu dans la table une fois la position résolue
+        move = reply(self.solver, state)
+        self.nodes = self.solver.nodes - nodes
+        return move
+
+
+class SearchPlayer:
+    """alpha-bêta de alquer/ai.py, borné en temps (budget) ou en profondeur (max_depth)"""
+
+    def __init__(self, max_bytes, budget, max_depth):
+        self.ai = AlphaBeta(budget, TranspositionTable(max_bytes), max_depth=max_depth)
+        self.nodes = 0
+
+    def move(self, state):
+        move = self.ai.best_move(state)
+        self.nodes = self.ai.nodes
+        return move
+
+
+class RandomPlayer:
+
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        self.nodes = 0
+
+    def move(self, state):
+        return self.random.choice(state.moves())
+
+
+def player(spec, max_bytes, seed=0):
+    """joueur décrit par spec (voir l'aide du module)"""
+    name, _, argument = spec.partition(':')
+    if name == 'exact':
+        return ExactPlayer(max_bytes)
+    if name == 'search':
+        return SearchPlayer(max_bytes, float(argument or 1.0), MAX_DEPTH)
+    if name == 'depth':
+        return SearchPlayer(max_bytes, float('inf'), int(argument or 1))
+    if name == 'random':
+        return RandomPlayer(seed)
+    raise ValueError(f'joueur inconnu : {spec}')
+
+
+def check_spec(spec):
+    """pour argparse : spec doit décrire un joueur"""
+    player(spec, 0)
+    return spec
+
+
+# joueurs du processus, créés à la première partie qui les utilise, et mémoire de la table de chacun
+players = {}
+MAX_BYTES = 64 * 2**20
+
+
+def init_worker(max_bytes):
+    global MAX_BYTES
+    MAX_BYTES = max_bytes
+
+
+def play(game):
+    """dispute une partie dans un processus de calcul, renvoie son résultat"""
+    width, height, lines, start, specs, opening, seed = game
+    sides = []
+    for spec in specs:
+        key = width, height, spec
+        if key not in players:
+            players[key] = player(spec, MAX_BYTES, seed)
+        sides.append(players[key])
+    chance = random.Random(seed)
+    state = BitState.initial(width, height, lines, start)
+    times, nodes = ([], []), ([], [])
+    plies = 0
+    while moves := state.moves():
+        if plies < opening:
+            move = chance.choice(moves)
+        else:
+            side = sides[state.player]
+            t_start = perf_counter()
+            move = side.move(state)
+            times[state.player].append(perf_counter() - t_start)
+            nodes[state.player].append(side.nodes)
+        state = state.play(move)
+        plies += 1
+    return {'width': width, 'height': height, 'lines': lines, 'start': COLORS[start],
+            'black': specs[BLACK], 'white': specs[WHITE], 'winner': COLORS[1 - state.player], 'plies': plies,
+            'times': {COLORS[c]: [round(t, 6) for t in times[c]] for c in (BLACK, WHITE)},
+            'nodes': {COLORS[c]: nodes[c] for c in (BLACK, WHITE)}}
+
+
+def games(boards, specs, count, opening, seed):
+    """parties à disputer : chaque paire de joueurs, chaque couleur, en alternant le joueur qui commence"""
+    grid = []
+    for width, height, lines in boards:
+        for black, white in permutations(specs, 2):
+            for index in range(count):
+                grid.append((width, height, lines, index % 2, (black, white), opening, seed + len(grid)))
+    return grid
+
+
+def percentile(values, fraction):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method='inclusive')[round(fraction * 100) - 1]
+
+
+def summary(results, elapsed):
+    """lignes du résumé des parties results, disputées en elapsed secondes"""
+    lines = []
+    moves = sum(len(times) for result in results for times in result['times'].values())
+    lines.append(f'{len(results)} parties, {moves} coups en {elapsed:.1f}s : '
+                 f'{len(results) / elapsed:.1f} parties/s, {moves / elapsed:.0f} coups/s')
+    boards = sorted({(r['width'], r['height'], r['lines']) for r in results})
+    for board in boards:
+        played = [r for r in results if (r['width'], r['height'], r['lines']) == board]
+        lines.append(f'\n{board[0]}x{board[1]}/{board[2]}')
+        lines.append(f"{'joueur':<14}{'contre':<14}{'parties':>8}{'victoires':>11}{'coups/partie':>14}")
+        pairs = sorted({tuple(sorted((r['black'], r['white']))) for r in played})
+        for first, second in pairs:
+            pair = [r for r in played if {r['black'], r['white']} == {first, second}]
+            wins = sum(r[r['winner']] == first for r in pair)
+            plies = statistics.mean(r['plies'] for r in pair)
+            lines.append(f'{first:<14}{second:<14}{len(pair):>8}{wins / len(pair):>10.1%}{plies:>14.1f}')
+        lines.append(f"{'joueur':<14}{'coups':>8}{'moyenne':>11}{'p50':>10}{'p95':>10}{'p99':>10}"
+                     f"{'positions/coup':>16}")
+        for spec in sorted({r[c] for r in played for c in COLORS}):
+            times = [t for r in played for c in COLORS if r[c] == spec for t in r['times'][c]]
+            nodes = [n for r in played for c in COLORS if r[c] == spec for n in r['nodes'][c]]
+            if not times:
+                continue
+            lines.append(f'{spec:<14}{len(times):>8}{statistics.mean(times) * 1000:>9.2f}ms'
+                         f'{percentile(times, 0.5) * 1000:>8.2f}ms{percentile(times, 0.95) * 1000:>8.2f}ms'
+                         f'{percentile(times, 0.99) * 1000:>8.2f}ms{statistics.mean(nodes):>16.0f}')
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="parties de l'IA contre elle-même")
+    board_arguments(parser, grid=True, start=None, memory=64,
+                    memory_help='Mémoire (en Mo) de la table de chaque joueur')
+    parser.add_argument('-p', '--players', help='Joueurs : exact, search:T, depth:N, random', type=check_spec,
+                        nargs='+', default=['exact', 'depth:2', 'random'])
+    parser.add_argument('-g', '--games', help='Parties par paire de joueurs et par couleur, 10 par défaut',
+                        type=int, default=10)
+    parser.add_argument('--opening', help='Nombre de premiers coups joués au hasard, 2 par défaut', type=int,
+                        default=2)
+    parser.add_argument('--seed', help='Graine du hasard, 0 par défaut', type=int, default=0)
+    parser.add_argument('-j', '--jobs', help='Nombre de processus', type=int, default=os.cpu_count())
+    parser.add_argument('-o', '--output', help='Fichier JSON Lines des parties')
+    args = parser.parse_args()
+
+    boards = []
+    for width in args.width:
+        for height in args.height:
+            for lines in args.lines:
+                board = width, height, normalise_lines(height, lines)
+                if board not in boards:
+                    boards.append(board)
+    grid = games(boards, args.players, args.games, args.opening, args.seed)
+
+    output = open(args.output, 'w') if args.output else None
+    results = []
+    t_start = perf_counter()
+    try:
+        with Pool(max(1, args.jobs), initializer=init_worker, initargs=(args.memory * 2**20,)) as pool:
+            # par paquets : chaque processus garde ses joueurs d'une partie à l'autre
+            for result in pool.imap_unordered(play, grid, chunksize=max(1, len(grid) // (8 * max(1, args.jobs)))):
+                results.append(result)
+                if output:
+                    print(json.dumps(result), file=output, flush=True)
+    finally:
+        if output:
+            output.close()
+    print('\n'.join(summary(results, perf_counter() - t_start)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Table de transposition en mémoire partagée entre les processus d'une machine
+
+Même rangement que alquer/transposition.py (seaux de deux cases, la première garde l'entrée la plus profonde,
+la seconde est toujours remplacée), mais les entrées sont des entiers de taille fixe rangés dans un segment
+multiprocessing.shared_memory : les processus de calcul (voir alquer/parallel.py) voient aussitôt les positions
+résolues par les autres. Une entrée occupe un ou plusieurs mots de 64 bits selon la taille du damier :
+
+    clé de la position (voir BitState.key) | draft (8 bits) | résultat (1 bit) | occupée (1 bit)
+
+Les écritures d'un seau se font sous l'un des STRIPES verrous, choisi d'après le seau. Une entrée d'un seul
+mot (damiers d'au plus 26 cases) se lit d'un bloc, donc sans verrou ; au-delà, la lecture prend aussi le verrou.
+"""
+
+from multiprocessing import Lock, resource_tracker, shared_memory
+
+from .transposition import DEFAULT_BYTES, MIX
+
+STRIPES = 64
+WORD_BYTES = 8
+
+
+def entry_words(width, height):
+    """nombre de mots d'une entrée : clé (2 bits par case et le joueur), draft, résultat et marque d'occupation"""
+    return (2 * width * height + 1 + 8 + 2 + 63) // 64
+
+
+def attach(name):
+    """ouvre le segment name créé par un autre processus"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # avant Python 3.13, ouvrir un segment l'enregistre aussi pour suppression à la fin du processus
+        memory = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(memory._name, 'shared_memory')
+        return memory
+
+
+class SharedTable:
+    """Table de transposition en mémoire partagée, pour les positions d'un damier width x height ;
+    s'utilise comme TranspositionTable. Le processus qui la crée la supprime avec unlink ; elle est transmise
+    aux autres processus à leur création (arguments d'un Process, initargs d'un pool) avec ses verrous.
+    """
+
+    def __init__(self, width, height, max_bytes=DEFAULT_BYTES):
+        self.width = width
+        self.height = height
+        self.max_bytes = max_bytes
+        self.words = entry_words(width, height)
+        self.buckets = max(1, max_bytes // (2 * self.words * WORD_BYTES))
+        self.memory = shared_memory.SharedMemory(create=True, size=2 * self.buckets * self.words * WORD_BYTES)
+        self.locks = [Lock() for _ in range(STRIPES)]
+        self.open()
+
+    def __getstate__(self):
+        return self.width, self.height, self.max_bytes, self.words, self.buckets, self.memory.name, self.locks
+
+    def __setstate__(self, state):
+        self.width, self.height, self.max_bytes, self.words, self.buckets, name, self.locks = state
+        self.memory = attach(name)
+        self.open()
+
+    def open(self):
+        self.array = self.memory.buf.cast('Q')
+        self.hits = self.misses = self.stores = 0
+
+    def read(self, slot):
+        if self.words == 1:
+            return self.array[slot]
+        return int.from_bytes(self.memory.buf[slot * WORD_BYTES:(slot + self.words) * WORD_BYTES], 'little')
+
+    def write(self, slot, entry):
+        if self.words == 1:
+            self.array[slot] = entry
+        else:
+            self.memory.buf[slot * WORD_BYTES:(slot + self.words) * WORD_BYTES] = entry.to_bytes(
+                self.words * WORD_BYTES, 'little')
+
+    def slots(self, key):
+        """(verrou, première case, seconde case) du seau de key"""
+        bucket = (hash(key) * MIX >> 32) % self.buckets
+        first = 2 * bucket * self.words
+        return self.locks[bucket % STRIPES], first, first + self.words
+
+    def new_search(self):
+        """sans effet : les entrées sont partagées par des recherches simultanées"""
+
+    def get(self, key):
+        """renvoie la valeur associée à key ou None"""
+        lock, first, second = self.slots(key)
+        if self.words == 1:
+            entries = self.read(first), self.read(second)
+        else:
+            with lock:
+                entries = self.read(first), self.read(second)
+        for entry in entries:
+            if entry & 1 and entry >> 10 == key:
+                self.hits += 1
+                return entry >> 1 & 1
+        self.misses += 1
+        return None
+
+    def best(self, key):
+        """les entrées n'ont pas de place pour le meilleur coup (voir alquer/strategy.py) : toujours None"""
+        return None
+
+    def store(self, key, value, draft, best=None):
+        entry = ((key << 8 | min(draft, 255)) << 1 | value) << 1 | 1
+        lock, first, second = self.slots(key)
+        self.stores += 1
+        with lock:
+            old = self.read(first)
+            if self.read(second) >> 10 == key:
+                self.write(second, 0)
+            if not old & 1 or old >> 10 == key or (old >> 2 & 255) <= draft:
+                if old & 1 and old >> 10 != key:
+                    # l'ancienne entrée profonde descend dans la case toujours remplacée
+                    self.write(second, old)
+                self.write(first, entry)
+            else:
+                self.write(second, entry)
+
+    def __len__(self):
+        """nombre d'entrées, en parcourant toute la table"""
+        return sum(1 for _ in self.items())
+
+    def items(self):
+        """itérateur sur les couples (clé, valeur) présents dans la table"""
+        for slot in range(0, 2 * self.buckets * self.words, self.words):
+            entry = self.read(slot)
+            if entry & 1:
+                yield entry >> 10, entry >> 1 & 1
+
+    def stats(self):
+        return {'entries': len(self), 'capacity': 2 * self.buckets, 'max_bytes': self.max_bytes,
+                'hits': self.hits, 'misses': self.misses, 'stores': self.stores}
+
+    def close(self):
+        self.array.release()
+        self.memory.close()
+
+    def unlink(self):
+        """ferme et supprime le segment (processus qui a créé la table)"""
+        self.close()
+        self.memory.unlink()
@@ -0,0 +1,164 @@
+"""
+Recherche itérative du gagnant, sans récursion
+
+La pile explicite contient, pour chaque position en cours d'examen, la liste de ses coups et l'indice
+du prochain coup à essayer : les positions filles sont construites une à une, au moment de les examiner,
+et l'examen d'une position s'arrête au premier coup gagnant. Les coups sont essayés dans l'ordre donné par
+alquer/ordering.py. Une position gagnante est rangée avec la clé de la position fille de son coup gagnant
+(voir alquer/strategy.py), sauf si ce coup laisse l'adversaire sans réponse.
+
+Un état doit fournir player, width, height, key() (voir BitState.key), moves(), count_moves(), has_moves()
+et play(move).
+"""
+
+from . import bitboard
+from .ordering import ordering as default_ordering
+from .transposition import table as default_table
+
+# nombre de positions examinées entre deux appels de Solver.progress
+PROGRESS_NODES = 4096
+
+
+class Interrupted(Exception):
+    """levée par un suivi (progress) pour abandonner la recherche ; les positions déjà résolues restent en table"""
+
+
+class Frame:
+    """Position en cours d'examen sur la pile"""
+
+    __slots__ = ('state', 'key', 'moves', 'index')
+
+    def __init__(self, state, key, moves):
+        self.state = state
+        self.key = key
+        self.moves = moves
+        self.index = 0
+
+
+class Solver:
+    """Calcul du gagnant avec une table de transposition ; nodes compte les positions examinées.
+    database est une base de positions résolues (voir alquer/database.py) consultée quand la table ne sait pas,
+    ordering l'ordre des coups (None : ordre de state.moves()).
+    progress, s'il n'est pas None, est appelé avec le solveur toutes les PROGRESS_NODES positions examinées ;
+    il peut lire la ligne en cours (line) pour reprendre plus tard la recherche (resume, voir alquer/checkpoint.py)
+    """
+
+    def __init__(self, table=default_table, database=None, ordering=default_ordering):
+        self.table = table
+        self.database = database
+        self.ordering = ordering
+        self.progress = None
+        self.nodes = 0
+        # clé de la dernière position fille résolue, celle du coup gagnant si elle est perdante
+        self.solved = None
+        self.stack = []
+        # reprise d'une recherche interrompue : état de l'ordre des coups et ligne à redescendre d'abord
+        self.resumed_ordering = None
+        self.resumed_line = []
+
+    def winner(self, state):
+        return state.player if self.solve(state) else 1 - state.player
+
+    def solve(self, root):
+        """renvoie True si le joueur courant de root gagne"""
+        geo = bitboard.geometry(root.width, root.height)
+        self.symmetries = geo.symmetries if geo.reduce else None
+        if self.ordering is not None:
+            # même ordre des coups d'une résolution à l'autre, sauf reprise
+            self.ordering.clear()
+            if self.resumed_ordering is not None:
+                self.ordering.restore(self.resumed_ordering)
+        self.resumed_ordering = None
+        stack = self.stack = []
+        wins = self.enter(root, stack)
+        while stack:
+            frame = stack[-1]
+            if wins is False:
+                # la position fille est perdante pour son joueur : coup gagnant
+                if self.ordering is not None:
+                    self.ordering.success(frame.moves[frame.index - 1], len(stack) - 1)
+                stack.pop()
+                self.leave(frame, True, self.solved)
+                wins = True
+                continue
+            # fille gagnante pour l'adversaire (ou position tout juste empilée) : coup suivant
+            if frame.index == len(frame.moves):
+                stack.pop()
+                self.leave(frame, False)
+                wins = False
+                continue
+            child = frame.state.play(frame.moves[frame.index])
+            frame.index += 1
+            wins = self.enter(child, stack)
+        self.resumed_line = []
+        return wins
+
+    def line(self):
+        """couples (clé canonique, coup en cours d'examen suivi des coups restant à essayer) des positions de la
+        pile, depuis la racine
+        """
+        return [(frame.key, frame.moves[frame.index - 1:]) for frame in self.stack if frame.index > 0]
+
+    def resume(self, ordering, line):
+        """la prochaine résolution reprend une recherche interrompue : l'ordre des coups part de l'état ordering
+        (voir MoveOrdering.state) et, dans chaque position de line (voir Solver.line), les coups sont essayés dans
+        l'ordre qu'ils avaient à l'arrêt, les coups déjà réfutés en dernier ; la recherche reprend ainsi là où
+        elle s'était arrêtée
+        """
+        self.resumed_ordering = ordering
+        self.resumed_line = line
+
+    def enter(self, state, stack):
+        """renvoie le résultat de state s'il est immédiat, sinon empile state et renvoie None"""
+        self.nodes += 1
+        if self.progress is not None and self.nodes % PROGRESS_NODES == 0:
+            self.progress(self)
+        symmetries = self.symmetries
+        key = raw_key = state.key()
+        if symmetries:
+            key = symmetries.canonical(raw_key)
+        self.solved = key
+        wins = self.table.get(key)
+        if wins is None and self.database is not None:
+            wins = self.database.get(key)
+            if wins is not None:
+                self.table.store(key, wins, (key >> 1).bit_count())
+        if wins is not None:
+            return bool(wins)
+        moves = state.moves()
+        if len(moves) == 0:
+            self.table.store(key, False, (key >> 1).bit_count())
+            return False
+        # le nombre de réponses ne sert qu'à l'ordre des coups, sinon il suffit de savoir s'il y en a
+        ordering = self.ordering
+        replies = []
+        for m in moves:
+            child = state.play(m)
+            count = child.count_moves() if ordering is not None else int(child.has_moves())
+            if count == 0:
+                self.table.store(key, True, (key >> 1).bit_count())
+                return True
+            replies.append(count)
+        if symmetries and symmetries.symmetric(raw_key):
+            # deux coups symétriques mènent à la même position : un seul est exploré
+            unique = {}
+            for m, count in zip(moves, replies):
+                unique.setdefault(symmetries.canonical(state.play(m).key()), (m, count))
+            moves, replies = zip(*unique.values())
+        if ordering is not None:
+            moves = ordering.order(moves, len(stack), replies)
+        line = self.resumed_line
+        if len(stack) < len(line) and line[len(stack)] is not None and line[len(stack)][0] == key:
+            resumed = [m for m in line[len(stack)][1] if m in moves]
+            moves = resumed + [m for m in moves if m not in resumed]
+            # la ligne n'est redescendue qu'une fois
+            line[len(stack)] = None
+        stack.append(Frame(state, key, moves))
+        return None
+
+    def leave(self, frame, wins, best=None):
+        self.solved = frame.key
+        self.table.store(frame.key, wins, (frame.key >> 1).bit_count(), best)
+
+
+solver = Solver()
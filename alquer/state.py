@@ -0,0 +1,129 @@
+"""
+État du jeu en coordonnées : ensembles des cases des pions noirs et blancs
+Même interface que BitState (alquer/bitboard.py), qui représente les pions par des entiers
+"""
+
+from dataclasses import dataclass, field
+
+from .bitboard import geometry
+from .rules import BLACK, WHITE, start_position
+from .solver import solver
+
+
+@dataclass(frozen=True, slots=True)
+class GameState:
+    """Un état du jeu d'alquerkonane', les attributs sont les coordonnées des pions noirs/blancs et un entier 0, 1 pour le joueur courant"""
+
+    width: int
+    height: int
+    black: frozenset
+    white: frozenset
+    player: int
+    # clé de la position (voir key) : calculée au premier appel de key, puis mise à jour coup par coup
+    packed: int = field(default=None, compare=False, repr=False)
+
+    def __hash__(self):
+        # la clé identifie la position : inutile de hacher les deux ensembles de pions
+        return hash(self.key())
+
+    @classmethod
+    def create(cls, width, height, black, white, player):
+        """construit un état à partir des ensembles de coordonnées des pions, comme BitState.create"""
+        return cls(width, height, frozenset(black), frozenset(white), player)
+
+    @classmethod
+    def initial(cls, width, height, lines, player):
+        black, white = start_position(width, height, lines)
+        return cls.create(width, height, black, white, player)
+
+    def get_moves(self):
+        """renvoie la liste des mouvements possibles sous la forme d'un ensemble de triplets
+        Le premier élément du triplet est le nouvel emplacement du pion. 
+        Les deux autres sont les pions qui disparaissent suite au mouvement : le premier est donc l'ancienne
+        position du pion qui bouge et le 2e est le pion adverse pris et donc peut-être à None si le mouvement n'est pas une prise
+        """
+        positions = self.black, self.white
+        return self.moves_of(positions[self.player])
+
+    def get_moves_from(self, i, j):
+        """renvoie la liste des mouvements possibles pour le pion en i, j sous la même forme que get_moves"""
+        return self.moves_of(((i, j),))
+
+    def moves_of(self, pawns):
+        """coups des pions pawns du joueur courant : les cases voisines et les coups sont précalculés par
+        taille de damier (voir alquer.bitboard.Geometry), sans test de bord ni tuple construit
+        """
+        geo = geometry(self.width, self.height)
+        positions = self.black, self.white
+        ennemies, occupied = positions[1 - self.player], self.black | self.white
+        steps, jumps = geo.step_moves[self.player], geo.jump_moves
+        possible_moves = set()
+        for pawn in pawns:
+            # déplacements possibles
+            for end, move in steps[pawn]:
+                if end not in occupied:
+                    possible_moves.add(move)
+            # prises possibles
+            for end, taken, move in jumps[pawn]:
+                if taken in ennemies and end not in occupied:
+                    possible_moves.add(move)
+        return possible_moves
+
+    def new_state(self, move):
+        ''' Génération d'un nouvel état du jeu en jouant un coup'''
+        new_position, pawn_1, pawn_2 = move
+        positions = self.black, self.white
+        player = self.player
+        pawns, ennemies = positions[player], positions[1 - player]
+        new_pawns = pawns - {pawn_1} | {new_position} # frozenset 
+        new_ennemies = ennemies - {pawn_2}            # frozenset 
+        # clé mise à jour : le pion qui part, le pion qui arrive, le pion pris et le joueur courant
+        keys = geometry(self.width, self.height).pawn_keys
+        packed = self.key() ^ keys[player][pawn_1] ^ keys[player][new_position] ^ 1
+        if pawn_2 is not None:
+            packed ^= keys[1 - player][pawn_2]
+        if player == BLACK:
+            return GameState(self.width, self.height, new_pawns, new_ennemies, WHITE, packed)
+        else:
+            return GameState(self.width, self.height, new_ennemies, new_pawns, BLACK, packed)
+
+    def key(self):
+        """entier compact identifiant la position, le même que BitState.key"""
+        packed = self.packed
+        if packed is None:
+            keys = geometry(self.width, self.height).pawn_keys
+            packed = sum(keys[BLACK][pawn] for pawn in self.black) + sum(keys[WHITE][pawn] for pawn in self.white)
+            packed |= self.player
+            object.__setattr__(self, 'packed', packed)
+        return packed
+
+    def moves(self):
+        """coups possibles sous forme de liste, interface attendue par alquer.solver ; triés par cases de départ
+        et d'arrivée : l'ordre d'un ensemble de coups (hachage de None) change d'un processus à l'autre
+        """
+        return sorted(self.get_moves(), key=lambda move: (move[1], move[0]))
+
+    def play(self, move):
+        return self.new_state(move)
+
+    def count_moves(self):
+        return len(self.get_moves())
+
+    def has_moves(self):
+        """le joueur courant a-t-il un coup possible ? s'arrête au premier pion qui peut jouer"""
+        geo = geometry(self.width, self.height)
+        positions = self.black, self.white
+        ennemies, occupied = positions[1 - self.player], self.black | self.white
+        steps, jumps = geo.step_moves[self.player], geo.jump_moves
+        for pawn in positions[self.player]:
+            for end, _ in steps[pawn]:
+                if end not in occupied:
+                    return True
+            for end, taken, _ in jumps[pawn]:
+                if taken in ennemies and end not in occupied:
+                    return True
+        return False
+
+    def winner(self):
+        """gagnant de la position, calculé sans récursion (voir alquer/solver.py)"""
+        return solver.winner(self)
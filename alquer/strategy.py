@@ -0,0 +1,210 @@
+"""
+Meilleurs coups des positions résolues : coup de l'IA, variation principale et stratégie gagnante
+python -m alquer.strategy -W 4 -H 4 -l 2 -s 1 [--solver pn] [-o 4x4.strategy]
+
+Les solveurs (alquer/solver.py, alquer/pns.py) rangent chaque position gagnante avec la clé canonique de la
+position fille de son coup gagnant (voir TranspositionTable.best) : le coup gagnant d'une position résolue se
+retrouve sans recherche, parmi ses coups, comme celui qui mène à cette position fille. Seuls les gains immédiats
+(l'adversaire n'a plus de coup) et les positions venues d'une base ou oubliées par la table n'ont pas de meilleur
+coup rangé ; il est alors retrouvé en résolvant les positions filles.
+
+La variation principale fait jouer au gagnant son coup gagnant et au perdant le premier coup dans l'ordre de
+alquer/ordering.py, comme l'IA qui perd. La stratégie gagnante est l'arbre des coups du gagnant contre toutes
+les réponses du perdant ; elle est écrite au fil du parcours, une entrée par position où joue le gagnant :
+
+    en-tête (comme alquer/database.py, avec sa propre marque) puis, pour chaque position, sa clé canonique
+    et celle de la position fille du coup gagnant, chacune sur un nombre fixe d'octets, dans l'ordre du parcours
+
+Une position où joue le perdant n'est pas écrite : toutes ses positions filles le sont.
+"""
+
+import argparse
+import os
+from time import perf_counter
+
+from .bitboard import BitState, geometry
+from .database import HEADER
+from .ordering import ordering
+from .pns import ProofNumberSolver
+from .solver import Solver
+from .transposition import TranspositionTable
+
+MAGIC = b'ALQST1'
+
+PAWNS = '●', '○'
+EMPTY = '·'
+
+
+def key_bytes(width, height):
+    """place d'une clé : 2 bits par case et le joueur courant"""
+    return (2 * width * height + 1 + 7) // 8
+
+
+def winning_move(search, state):
+    """coup gagnant de state (l'un de state.moves()), None si le joueur courant perd ; state est résolu par
+    search s'il ne l'est pas déjà
+    """
+    if not search.solve(state):
+        return None
+    canonical = geometry(state.width, state.height).canonical
+    best = search.table.best(canonical(state.key()))
+    children = [(m, state.play(m)) for m in state.moves()]
+    if best is not None:
+        for m, child in children:
+            if canonical(child.key()) == best:
+                return m
+    # gain immédiat, ou coup gagnant inconnu de la table : les positions filles sont résolues
+    for m, child in children:
+        if not child.has_moves():
+            return m
+    for m, child in children:
+        if not search.solve(child):
+            return m
+    raise AssertionError(f'position gagnante sans coup gagnant : {state}')
+
+
+def reply(search, state):
+    """coup joué dans state : le coup gagnant, ou le premier coup dans l'ordre déterministe de l'IA si le joueur
+    courant perd (prises, puis ceux qui laissent le moins de réponses) ; None si la partie est finie
+    """
+    move = winning_move(search, state)
+    if move is not None:
+        return move
+    moves = state.moves()
+    if not moves:
+        return None
+    return ordering.order(moves, 0, [state.play(m).count_moves() for m in moves])[0]
+
+
+def principal_variation(search, state):
+    """coups de la partie jouée depuis state par le gagnant et le perdant (voir reply) jusqu'à la fin"""
+    variation = []
+    while (move := reply(search, state)) is not None:
+        variation.append(move)
+        state = state.play(move)
+    return variation
+
+
+def picture(state):
+    """lignes du damier de state : pions noirs, pions blancs et cases vides"""
+    black, white = state.black, state.white
+    return [''.join(PAWNS[0] if (i, j) in black else PAWNS[1] if (i, j) in white else EMPTY
+                    for j in range(state.width))
+            for i in range(state.height)]
+
+
+def notation(state, move):
+    """coup move de state (sous la forme de state.moves()) en coordonnées"""
+    if isinstance(state, BitState):
+        move = state.coordinates(move)
+    end, start, taken = move
+    return f'{start} → {end}' + (f' prend {taken}' if taken is not None else '')
+
+
+def export(search, state, path):
+    """écrit dans path la stratégie gagnante depuis state (voir l'en-tête du module), renvoie son nombre de
+    positions ; les positions sont résolues par search au besoin
+    """
+    if not isinstance(state, BitState):
+        state = BitState.create(state.width, state.height, state.black, state.white, state.player)
+    geo = state.geo
+    size = key_bytes(geo.width, geo.height)
+
+    def canonical(position):
+        return BitState.from_key(geo, geo.canonical(position.key()))
+
+    root = canonical(state)
+    # positions où joue le gagnant, encore à écrire
+    stack = [root] if search.solve(root) else [canonical(root.play(m)) for m in reversed(root.moves())]
+    seen = set()
+    count = 0
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, geo.width, geo.height, 0))
+        while stack:
+            position = stack.pop()
+            if position.packed in seen:
+                continue
+            seen.add(position.packed)
+            loser = canonical(position.play(winning_move(search, position)))
+            file.write(position.packed.to_bytes(size, 'big') + loser.packed.to_bytes(size, 'big'))
+            count += 1
+            for m in reversed(loser.moves()):
+                child = canonical(loser.play(m))
+                if child.packed not in seen:
+                    stack.append(child)
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, geo.width, geo.height, count))
+    return count
+
+
+def load(path):
+    """(largeur, hauteur, dictionnaire clé -> clé de la position fille du coup gagnant) d'une stratégie écrite
+    par export
+    """
+    with open(path, 'rb') as file:
+        magic, width, height, count = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} n'est pas un fichier de stratégie")
+        size = key_bytes(width, height)
+        moves = {}
+        for _ in range(count):
+            record = file.read(2 * size)
+            moves[int.from_bytes(record[:size], 'big')] = int.from_bytes(record[size:], 'big')
+    return width, height, moves
+
+
+def check(path):
+    """vérifie, sans aucun calcul du gagnant, que la stratégie de path gagne contre toutes les réponses :
+    chaque coup gagnant est un coup possible et chaque réponse du perdant mène à une position de la stratégie ;
+    renvoie son nombre de positions, lève ValueError sinon
+    """
+    width, height, moves = load(path)
+    geo = geometry(width, height)
+    for key, best in moves.items():
+        position = BitState.from_key(geo, key)
+        if all(geo.canonical(position.play(m).key()) != best for m in position.moves()):
+            raise ValueError(f'{path} : coup impossible dans la position {key:#x}')
+        loser = BitState.from_key(geo, best)
+        for m in loser.moves():
+            if geo.canonical(loser.play(m).key()) not in moves:
+                raise ValueError(f'{path} : pas de coup après la réponse {key:#x} -> {best:#x}')
+    return len(moves)
+
+
+def main():
+    # alquer.engine importe ce module
+    from .engine import board_arguments, normalise_lines
+
+    parser = argparse.ArgumentParser(description="variation principale et stratégie gagnante d'une configuration")
+    board_arguments(parser)
+    parser.add_argument('--solver', choices=('dfs', 'pn'), default='dfs')
+    parser.add_argument('-o', '--output', help='Fichier de la stratégie gagnante, vérifié après écriture')
+    args = parser.parse_args()
+    lines = normalise_lines(args.height, args.lines)
+    table = TranspositionTable(args.memory * 2**20)
+    search = ProofNumberSolver(table) if args.solver == 'pn' else Solver(table)
+    state = BitState.initial(args.width, args.height, lines, args.start)
+
+    t_start = perf_counter()
+    winner = search.winner(state)
+    print(f'{args.width}x{args.height}/{lines} : {("Black", "White")[winner]} gagne '
+          f'({perf_counter() - t_start:.2f}s, {search.nodes} positions)')
+    t_start = perf_counter()
+    variation = principal_variation(search, state)
+    print(f'Variation principale, {len(variation)} coups ({perf_counter() - t_start:.3f}s) :')
+    print('\n'.join(picture(state)))
+    for number, move in enumerate(variation, 1):
+        print(f'\n{number}. {("Black", "White")[state.player]} {notation(state, move)}')
+        state = state.play(move)
+        print('\n'.join(picture(state)))
+
+    if args.output:
+        t_start = perf_counter()
+        count = export(search, BitState.initial(args.width, args.height, lines, args.start), args.output)
+        print(f'\nStratégie : {count} positions, {os.path.getsize(args.output)} octets dans {args.output} '
+              f'({perf_counter() - t_start:.2f}s)')
+        print(f'Vérifiée : {check(args.output)} positions')
+
+
+if __name__ == '__main__':
+    main()
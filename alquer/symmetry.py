@@ -0,0 +1,84 @@
+"""
+Symétries du damier et clés canoniques des positions
+
+Les règles sont invariantes par la symétrie gauche-droite (mirror) et par la symétrie haut-bas accompagnée
+de l'échange des couleurs et du joueur courant (flip). Mais les pions noirs restent toujours sur les cases
+(i + j) paires et les blancs sur les impaires : l'image d'une position n'est atteignable depuis le début de
+partie que si la symétrie conserve ces couleurs de cases, ce qui dépend de la parité de width et height :
+- mirror : width impaire
+- flip : height paire
+- mirror + flip : width + height impaire
+Les autres symétries ne feraient que ralentir le calcul sans jamais identifier deux positions rencontrées.
+
+Comme flip échange le joueur courant, les tables mémorisent si le joueur courant gagne et non la couleur gagnante.
+"""
+
+
+class Symmetries:
+    """Calcul de la clé canonique (la plus petite clé parmi les images par les symétries utiles)
+    d'une clé de position (pions noirs, pions blancs, joueur courant), voir BitState.key
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.mirror = width % 2 == 1
+        self.flip = height % 2 == 0
+        self.mirror_flip = (width + height) % 2 == 1
+        self.full = (1 << self.size) - 1
+        column = sum(1 << (i * width) for i in range(height))
+        row = (1 << width) - 1
+        # échanges de colonnes (masque de la colonne de gauche, décalage) et colonne du milieu éventuelle
+        self.column_swaps = [(column << j, width - 1 - 2*j) for j in range(width // 2)]
+        self.middle_column = column << (width // 2) if width % 2 else 0
+        # de même pour les lignes
+        self.row_swaps = [(row << (i * width), (height - 1 - 2*i) * width) for i in range(height // 2)]
+        self.middle_row = row << (height // 2 * width) if height % 2 else 0
+
+    def __bool__(self):
+        return self.mirror or self.flip or self.mirror_flip
+
+    def names(self):
+        return [name for name in ('mirror', 'flip', 'mirror_flip') if getattr(self, name)]
+
+    def reflect(self, bits):
+        """symétrie gauche-droite d'un ensemble de cases"""
+        result = bits & self.middle_column
+        for mask, shift in self.column_swaps:
+            result |= (bits & mask) << shift | bits >> shift & mask
+        return result
+
+    def turn(self, bits):
+        """symétrie haut-bas d'un ensemble de cases"""
+        result = bits & self.middle_row
+        for mask, shift in self.row_swaps:
+            result |= (bits & mask) << shift | bits >> shift & mask
+        return result
+
+    def symmetric(self, key):
+        """la position est-elle sa propre image par la symétrie gauche-droite ?
+        Seule celle-ci conserve le joueur courant : deux coups d'une telle position peuvent être symétriques
+        """
+        if not self.mirror:
+            return False
+        white = key >> 1 & self.full
+        black = key >> (self.size + 1)
+        return self.reflect(black) == black and self.reflect(white) == white
+
+    def canonical(self, key):
+        size = self.size
+        player = key & 1
+        white = key >> 1 & self.full
+        black = key >> (size + 1)
+        best = key
+        if self.mirror or self.mirror_flip:
+            black_mirror, white_mirror = self.reflect(black), self.reflect(white)
+            if self.mirror:
+                best = min(best, (black_mirror << size | white_mirror) << 1 | player)
+            if self.mirror_flip:
+                # haut-bas et échange des couleurs : les blancs retournés deviennent les noirs
+                best = min(best, (self.turn(white_mirror) << size | self.turn(black_mirror)) << 1 | (1 - player))
+        if self.flip:
+            best = min(best, (self.turn(white) << size | self.turn(black)) << 1 | (1 - player))
+        return best
@@ -0,0 +1,127 @@
+"""
+Table de transposition de taille bornée pour la recherche du gagnant
+Les positions sont identifiées par un entier compact (voir BitState.key)
+"""
+
+DEFAULT_BYTES = 256 * 2**20
+
+# place d'une entrée au plus : pointeurs de liste (clé, meilleur coup), 3 octets, et deux entiers Python (la clé et
+# celle de la position fille du meilleur coup) de 40 octets chacun, pour des clés d'au plus 90 bits (44 cases)
+ENTRY_BYTES = 100
+
+# constante de mélange (hachage multiplicatif) : les clés ont trop de structure pour un simple modulo
+MIX = 0x9E3779B97F4A7C15
+
+
+class TranspositionTable:
+    """Table à deux cases par seau : la première garde l'entrée la plus profonde (ou la plus récente recherche),
+    la seconde est remplacée à chaque fois. La profondeur (draft) est le nombre de pions sur le damier :
+    plus il y en a, plus la position est proche de la racine et coûteuse à recalculer.
+    Une position gagnante peut garder son meilleur coup, sous la forme de la clé de la position fille qu'il donne
+    (voir best et alquer/strategy.py).
+    """
+
+    def __init__(self, max_bytes=DEFAULT_BYTES):
+        self.resize(max_bytes)
+
+    def resize(self, max_bytes):
+        """fixe le budget mémoire (en octets) et vide la table"""
+        self.max_bytes = max_bytes
+        self.buckets = max(1, max_bytes // (2 * ENTRY_BYTES))
+        self.clear()
+
+    def clear(self):
+        # les tableaux ne sont alloués qu'au premier stockage
+        self.keys = []
+        self.values = self.drafts = self.ages = self.moves = None
+        self.age = 0
+        self.entries = 0
+        self.hits = self.misses = self.stores = self.evictions = 0
+
+    def allocate(self):
+        """réserve les tableaux de la table (fait au premier stockage sinon)"""
+        slots = 2 * self.buckets
+        self.keys = [None] * slots
+        self.values = bytearray(slots)
+        self.drafts = bytearray(slots)
+        self.ages = bytearray(slots)
+        self.moves = [None] * slots
+
+    def new_search(self):
+        """les entrées des recherches précédentes deviennent remplaçables en priorité"""
+        self.age = (self.age + 1) % 256
+
+    def get(self, key):
+        """renvoie la valeur associée à key ou None"""
+        keys = self.keys
+        if keys:
+            slot = 2 * ((hash(key) * MIX >> 32) % self.buckets)
+            if keys[slot] == key:
+                self.hits += 1
+                return self.values[slot]
+            if keys[slot + 1] == key:
+                self.hits += 1
+                return self.values[slot + 1]
+        self.misses += 1
+        return None
+
+    def best(self, key):
+        """clé de la position fille du meilleur coup de la position key, None si elle n'est pas connue"""
+        keys = self.keys
+        if keys:
+            slot = 2 * ((hash(key) * MIX >> 32) % self.buckets)
+            if keys[slot] == key:
+                return self.moves[slot]
+            if keys[slot + 1] == key:
+                return self.moves[slot + 1]
+        return None
+
+    def store(self, key, value, draft, best=None):
+        """range la valeur de key ; best est la clé de la position fille du meilleur coup, s'il est connu"""
+        if not self.keys:
+            self.allocate()
+        keys, values, drafts, ages, moves = self.keys, self.values, self.drafts, self.ages, self.moves
+        self.stores += 1
+        slot = 2 * ((hash(key) * MIX >> 32) % self.buckets)
+        if keys[slot + 1] == key:
+            keys[slot + 1] = None
+            self.entries -= 1
+        old = keys[slot]
+        if old is None or old == key or ages[slot] != self.age or drafts[slot] <= draft:
+            if old is not None and old != key:
+                # l'ancienne entrée profonde descend dans la case toujours remplacée
+                keys[slot] = None
+                self.entries -= 1
+                self._put(slot + 1, old, values[slot], drafts[slot], ages[slot], moves[slot])
+            self._put(slot, key, value, draft, self.age, best)
+        else:
+            self._put(slot + 1, key, value, draft, self.age, best)
+
+    def _put(self, slot, key, value, draft, age, best):
+        old = self.keys[slot]
+        if old is None:
+            self.entries += 1
+        elif old != key:
+            self.evictions += 1
+        self.keys[slot] = key
+        self.values[slot] = value
+        self.drafts[slot] = min(draft, 255)
+        self.ages[slot] = age
+        self.moves[slot] = best
+
+    def __len__(self):
+        return self.entries
+
+    def items(self):
+        """itérateur sur les couples (clé, valeur) présents dans la table"""
+        for key, value in zip(self.keys, self.values or ()):
+            if key is not None:
+                yield key, value
+
+    def stats(self):
+        return {'entries': self.entries, 'capacity': 2 * self.buckets, 'max_bytes': self.max_bytes,
+                'hits': self.hits, 'misses': self.misses, 'stores': self.stores, 'evictions': self.evictions}
+
+
+# table partagée par les moteurs (GameState, BitState) : une même position a la même clé dans les deux
+table = TranspositionTable()
@@ -0,0 +1,144 @@
+"""
+Génération des coups d'un lot de positions avec NumPy (damiers d'au plus 64 cases)
+
+Un lot de N positions est un triplet de tableaux de longueur N : black et white (uint64, un bit par case
+comme dans BitState) et player (uint8). Pour chaque direction de MOVES et TAKES, les arrivées de tous les pions de
+toutes les positions sont calculées d'un coup par décalages et masques (les mêmes que BitState.count_moves),
+puis chaque bit d'arrivée devient un coup.
+
+NumPy n'est nécessaire qu'à ce module, qui n'est pas importé par le paquet alquer.
+"""
+
+from functools import cache
+
+import numpy as np
+
+from .bitboard import BitState, geometry
+from .rules import BLACK, WHITE
+
+ONE = np.uint64(1)
+
+
+class VectorGeometry:
+    """Décalages et masques d'un damier sous forme de scalaires uint64"""
+
+    def __init__(self, width, height):
+        geo = geometry(width, height)
+        if geo.size > 64:
+            raise ValueError(f'damier {width}x{height} : au plus 64 cases pour les lots NumPy')
+        self.geo = geo
+        self.full = np.uint64(geo.full)
+        self.steps = tuple(tuple(self.convert(shift) for shift in shifts) for shifts in geo.step_shifts)
+        self.jumps = tuple(self.convert(shift) for shift in geo.jump_shifts)
+
+    @staticmethod
+    def convert(shift):
+        left, right, mask = shift
+        return np.uint64(left), np.uint64(right), np.uint64(mask)
+
+
+@cache
+def vector_geometry(width, height):
+    return VectorGeometry(width, height)
+
+
+def encode(states):
+    """lot des états (BitState) states"""
+    count = len(states)
+    black = np.fromiter((state.black_bits for state in states), np.uint64, count)
+    white = np.fromiter((state.white_bits for state in states), np.uint64, count)
+    player = np.fromiter((state.player for state in states), np.uint8, count)
+    return black, white, player
+
+
+def decode(width, height, black, white, player):
+    """liste des états (BitState) du lot"""
+    geo = geometry(width, height)
+    return [BitState(geo, (int(b) << geo.size | int(w)) << 1 | int(p)) for b, w, p in zip(black, white, player)]
+
+
+def sides(black, white, player):
+    """pions du joueur courant et pions adverses de chaque position"""
+    to_move = player == BLACK
+    return np.where(to_move, black, white), np.where(to_move, white, black)
+
+
+def split_bits(targets):
+    """(indices, bits) : un couple par bit à 1 de chaque élément de targets"""
+    index = np.nonzero(targets)[0]
+    bits = targets[index]
+    indices, lows = [], []
+    while index.size:
+        low = bits & (~bits + ONE)
+        indices.append(index)
+        lows.append(low)
+        bits = bits ^ low
+        remaining = bits != 0
+        index, bits = index[remaining], bits[remaining]
+    if not indices:
+        return np.empty(0, np.intp), np.empty(0, np.uint64)
+    return np.concatenate(indices), np.concatenate(lows)
+
+
+def targets(width, height, black, white, player):
+    """générateur des (arrivées, décalage, prise) par direction : arrivées est un tableau uint64 des cases
+    d'arrivée de chaque position, prise vaut True pour les directions de TAKES
+    """
+    vg = vector_geometry(width, height)
+    pawns, ennemies = sides(black, white, player)
+    empty = ~(pawns | ennemies) & vg.full
+    zero = np.uint64(0)
+    for side in (BLACK, WHITE):
+        to_move = player == side
+        for left, right, mask in vg.steps[side]:
+            yield np.where(to_move, ((pawns & mask) << left >> right) & empty, zero), (left, right), False
+    for left, right, mask in vg.jumps:
+        taken = ((pawns & mask) << left >> right) & ennemies
+        yield (taken << left >> right) & empty, (left, right), True
+
+
+def popcount(bits):
+    """nombre de bits à 1 de chaque élément d'un tableau uint64"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).astype(np.int64)
+    bits = bits - ((bits >> ONE) & np.uint64(0x5555555555555555))
+    bits = (bits & np.uint64(0x3333333333333333)) + ((bits >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    bits = (bits + (bits >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((bits * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int64)
+
+
+def count_moves(width, height, black, white, player):
+    """nombre de coups possibles de chaque position du lot"""
+    counts = np.zeros(len(black), np.int64)
+    for ends, _, _ in targets(width, height, black, white, player):
+        counts += popcount(ends)
+    return counts
+
+
+def successors(width, height, black, white, player):
+    """tous les coups et toutes les positions filles du lot, sous forme d'un dictionnaire de tableaux :
+    parent (indice de la position jouée), start, end, taken (bits du coup, comme BitState.moves),
+    black, white, player (les positions filles)
+    """
+    parents, starts, ends, takens = [], [], [], []
+    for direction_ends, (left, right), capture in targets(width, height, black, white, player):
+        index, end = split_bits(direction_ends)
+        back = end << right >> left
+        if capture:
+            taken, start = back, back << right >> left
+        else:
+            taken, start = np.zeros_like(end), back
+        parents.append(index)
+        starts.append(start)
+        ends.append(end)
+        takens.append(taken)
+    parent = np.concatenate(parents)
+    start, end, taken = np.concatenate(starts), np.concatenate(ends), np.concatenate(takens)
+    to_move = player[parent] == BLACK
+    moved = start ^ end
+    return {
+        'parent': parent, 'start': start, 'end': end, 'taken': taken,
+        'black': np.where(to_move, black[parent] ^ moved, black[parent] ^ taken),
+        'white': np.where(to_move, white[parent] ^ taken, white[parent] ^ moved),
+        'player': (1 - player[parent]).astype(np.uint8),
+    }
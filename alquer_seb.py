@@ -3,22 +3,19 @@ Jeu Alquerkonane
 Variante à partir de la version de Fab
 """
 
-from dataclasses import dataclass
-from functools import cache
-import PySimpleGUI as sg
 import argparse
+import base64
+import os
+import queue
+import threading
 from time import perf_counter
-
-BLACK = 0
-WHITE = 1
-
-# Tuples d'infos... noir toujours en indice 0
-#
-BLACK_MOVES = (1, -1), (1, 1)
-WHITE_MOVES = (-1, -1), (-1, 1)
-
-MOVES = BLACK_MOVES, WHITE_MOVES
-TAKES = (0, 2), (0, -2), (2, 0), (-2, 0)
+from alquer import BLACK, WHITE, BitState
+from alquer.database import Database, save
+from alquer.engine import AIS, SOLVERS, STATES, ExactAI, SearchAI, initial_state, new_solver, normalise_lines
+from alquer.parallel import parallel_winner
+from alquer.solver import PROGRESS_NODES, Interrupted, solver
+from alquer.strategy import notation, picture, principal_variation
+from alquer.transposition import table
 
 PAWN_FILES = 'black_pawn.png', 'white_pawn.png'
 EMPTY_FILES = 'black.png', 'white.png' 
@@ -32,6 +29,12 @@ RESULTS = ('wins', ''), ('', 'wins')
 KEYS = 'Black', 'White'
 ALIGN = 'lr'
 
+# événements envoyés à la fenêtre par le thread de calcul
+WINNER_EVENT = 'Winner'
+AI_EVENT = 'AI'
+PROGRESS_EVENT = 'Progress'
+PROGRESS_DELAY = 0.2 # secondes entre deux affichages de l'avancement
+
 # Aide des options
 
 HELP_W = 'Largeur du damier, valeur par défaut 4'
@@ -39,17 +42,32 @@ HELP_H = 'Hauteur du damier, valeur par défaut 4'
 HELP_L = 'Nombre de lignes de pions, 1 ou 2 (par défaut)'
 HELP_WHO_START = "Identifiant du joueur qui commence : 0 = Black, 1 = White (par défaut)"
 HELP_GET_WINNER = "Booléen ; si True le joueur gagnant est calculé et affiché dans les infos"
+HELP_MEMORY = "Taille maximale (en Mo) de la table de transposition du calcul du gagnant, 256 par défaut"
+HELP_ENGINE = "Représentation des états : sets = ensembles de coordonnées (par défaut), bits = bitboards"
+HELP_JOBS = "Nombre de processus pour le calcul du gagnant au démarrage, 1 par défaut"
+HELP_SHARED = "Avec --jobs, les processus partagent une même table en mémoire partagée (de la taille de --memory)"
+HELP_SPLIT = "Profondeur (en coups depuis la racine) des positions réparties entre les processus, 1 par défaut"
+HELP_SOLVER = "Calcul du gagnant : dfs = recherche en profondeur (par défaut), pn = nombres de preuve (df-pn)"
+HELP_AI = "IA : exact = calcul exact du gagnant (par défaut), search = alpha-bêta en temps borné (voir --think)"
+HELP_THINK = "Temps de réflexion (en s) de l'IA search par coup, 1 par défaut"
+HELP_PROFILE = "Mesures du calcul du gagnant (positions, table, temps par opération), rapport au démarrage et en fin de partie"
+HELP_PV = "Affiche la variation principale (meilleurs coups des deux joueurs) après le calcul du gagnant"
+HELP_DATABASE = "Fichier des positions résolues : consulté par le calcul du gagnant et l'IA, complété en fin de partie"
 
 
 class View:
 
     def __init__(self, controller):
+        # importé ici : le modèle et les états s'utilisent sans interface graphique (voir bench/)
+        import PySimpleGUI as sg
         self.ctrl = controller
         self.height = controller.height
         self.width = controller.width
         # ligne d'informations sur les joueurs noir / blanc : qui joue, qui est gagnant etc.
         top = [sg.Text("", key=KEYS[BLACK], size=(15,1), justification=ALIGN[BLACK]),
                sg.Text("", key=KEYS[WHITE], size=(15,1), justification=ALIGN[WHITE])]
+        # avancement du calcul en cours (voir Worker)
+        progress = sg.Text("", key=PROGRESS_EVENT, size=(22,1), justification='c')
 
         # la zone damier
         grid = [[sg.Button('', key=(lig, col), pad=(0, 0)) for col in range(self.width)] for lig in range(self.height)]
@@ -58,7 +76,7 @@ class View:
         menu =[sg.Button("Undo"), sg.Button("Reset"), sg.Button("Exit")]
 
         # le layout global
-        layout = [[top[BLACK], sg.Stretch(), top[WHITE]],
+        layout = [[top[BLACK], sg.Stretch(), progress, sg.Stretch(), top[WHITE]],
                   [sg.HSeparator()],
                   [grid],
                   [sg.HSeparator()],
@@ -66,10 +84,42 @@ class View:
         
         # la fenêtre principale
         self.window = sg.Window('Alquerkonane', layout, finalize=True)
+        # images décodées une seule fois, et contenus des fichiers lus une seule fois, par nom de fichier
+        self.images = {}
+        self.data = {}
+
+    def image(self, filename):
+        image = self.images.get(filename)
+        if image is None:
+            import tkinter as tk
+            image = self.images[filename] = tk.PhotoImage(file=filename)
+        return image
+
+    def show_image(self, button, filename):
+        """Affiche l'image du fichier filename sur le bouton button.
+        L'API privée de PySimpleGUI (UseTtkButtons, TKButton) est utilisée exprès : Button.Update(image_filename=...)
+        relit et décode le fichier à chaque appel, ce qui ralentit le rafraîchissement du damier. Si cette API
+        n'existe pas ou ne s'applique pas (boutons ttk, autre version de PySimpleGUI), le contenu du fichier, lu
+        une seule fois, est passé à Button.Update(image_data=...).
+        """
+        tk_button = getattr(button, 'TKButton', None)
+        if tk_button is not None and getattr(button, 'UseTtkButtons', True) is False:
+            try:
+                image = self.image(filename)
+                tk_button.config(highlightthickness=0, image=image, width=image.width(), height=image.height())
+                tk_button.image = image
+                return
+            except (AttributeError, TypeError):
+                pass
+        data = self.data.get(filename)
+        if data is None:
+            with open(filename, 'rb') as file:
+                data = self.data[filename] = base64.b64encode(file.read())
+        button.Update(image_data=data)
 
     def set_grid(self, i, j, filename):
         """Met à jour la vue de la case de coordonnée i, j avec le fichier image filename"""
-        self.window[i, j].Update(image_filename=filename)
+        self.show_image(self.window[i, j], filename)
 
     def set_text(self, current_player_txt, current_winner_txt, counts):
         """Met à jour les textes en haut de la fenêtre
@@ -84,12 +134,78 @@ class View:
             count = counts[player_id]
             self.window[key].Update(f'{turn_txt} {key} : {count} {winner_txt}')
 
+    def set_progress(self, text):
+        self.window[PROGRESS_EVENT].Update(text)
+
     def close(self):
         self.window.Close()
 
     def read(self):
-        event, _ = self.window.read()
-        return event
+        """(événement, valeur) : la valeur est celle envoyée par write_event_value, None pour les autres événements"""
+        event, values = self.window.read()
+        return event, values.get(event) if values else None
+
+
+class Worker:
+    """Thread des calculs longs (gagnant, coup de l'IA) : la fenêtre reste réactive pendant la recherche.
+    Chaque calcul demandé par submit renvoie son résultat à la fenêtre par write_event_value, avec la génération
+    à laquelle il a été demandé ; cancel change de génération : les calculs en attente sont abandonnés, celui en
+    cours est interrompu par le suivi des solveurs (voir alquer.solver.Interrupted) et son résultat ignoré
+    """
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.jobs = queue.Queue()
+        self.generation = 0
+        self.current = None
+        self.nodes = 0
+        self.started = self.shown = 0
+        for search in {solver, controller.solver}:
+            search.progress = self.progress
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, event, function, *args):
+        self.jobs.put((self.generation, event, function, args))
+
+    def cancel(self):
+        self.generation += 1
+
+    def stop(self):
+        """abandonne les calculs et attend la fin du thread (avant d'enregistrer la table par exemple)"""
+        self.cancel()
+        self.jobs.put(None)
+        self.thread.join()
+
+    def run(self):
+        while (job := self.jobs.get()) is not None:
+            generation, event, function, args = job
+            if generation != self.generation:
+                continue
+            self.current, self.nodes = generation, 0
+            self.started = self.shown = perf_counter()
+            try:
+                result = function(*args)
+            except Interrupted:
+                continue
+            self.post(event, generation, (result, perf_counter() - self.started))
+
+    def check(self):
+        """lève Interrupted si le calcul en cours a été abandonné (cancel), dans le thread de calcul"""
+        if self.current != self.generation:
+            raise Interrupted
+
+    def progress(self, search):
+        """appelé par le solveur toutes les PROGRESS_NODES positions, dans le thread de calcul"""
+        self.check()
+        self.nodes += PROGRESS_NODES
+        now = perf_counter()
+        if now - self.shown >= PROGRESS_DELAY:
+            self.shown = now
+            self.post(PROGRESS_EVENT, self.current, (self.nodes, now - self.started))
+
+    def post(self, event, generation, value):
+        self.controller.view.window.write_event_value(event, (generation, value))
 
 
 class Model:
@@ -100,14 +216,8 @@ class Model:
         self.end = False
 
     def initial_state(self, player_id):
-        height, width, lines = self.controller.game_size()
-        if  height % 2 == 0:
-            white = {(height-i-1, j + i%2) for j in range(0, width, 2) for i in range(lines) if width > j + i%2}
-            black = {(i, j + i%2) for j in range(0, width, 2) for i in range(lines) if width > j + i%2} 
-        else:
-            white = {(height-i-1, j + i%2 - 1) for j in range(0, width+1, 2) for i in range(lines) if width > j + i%2 - 1 >= 0}
-            black = {(i, j + i%2) for j in range(0, width, 2) for i in range(lines) if width > j + i%2 >=0}
-        return GameState(width, height, frozenset(black), frozenset(white), player_id)
+        width, height, lines = self.controller.game_size()
+        return initial_state(self.controller.engine, width, height, lines, player_id)
 
     def player(self):
         return self.states[-1].player
@@ -121,16 +231,14 @@ class Model:
 
     def valid(self, i, j):
         state = self.state()
-        player = state.player
         positions = state.black, state.white
-        pawns, ennemies, moves = positions[player], positions[1 - player], MOVES[player]
-        if (i, j) not in pawns:
+        if (i, j) not in positions[state.player]:
             return False
-        candidates = state.get_moves_from(i, j, ennemies, moves)
-        return len(candidates) > 0
+        return len(self.get_moves_from(i, j)) > 0
 
     def undo(self):
-        if self.states:
+        # la position de départ reste
+        if len(self.states) > 1:
             self.states.pop()
 
     def play(self, move):
@@ -138,102 +246,40 @@ class Model:
         self.states.append(state)
         player = state.player
         positions = state.black, state.white
-        if len(positions[player]) == 0 or len(state.get_moves()) == 0:
+        if len(positions[player]) == 0 or not state.has_moves():
             self.end = True
 
     def get_moves_from(self, i, j):
-        state = self.state()
-        player = state.player
-        positions = state.black, state.white
-        ennemies, moves = positions[1 - player], MOVES[player]
-        return state.get_moves_from(i, j, ennemies, moves)
-
-    def winner(self):
-        return self.state().winner()
-
-    def ia_play(self):
-        state = self.state()
-        moves = state.get_moves()
-        for m in moves:
-            new_state = state.new_state(m)
-            if new_state.winner() == state.player:
-                self.play(m)
-                return
-        print('Aucun coup gagnant... random move')
-        self.play(moves.pop())
-
-
-@dataclass(frozen=True)
-class GameState:
-    """Un état du jeu d'alquerkonane', les attributs sont les coordonnées des pions noirs/blancs et un entier 0, 1 pour le joueur courant"""
-
-    width: int
-    height: int
-    black: frozenset
-    white: frozenset
-    player: int
+        return self.state().get_moves_from(i, j)
 
-    def inside(self, i, j):
-        return 0 <= i < self.height and 0 <= j < self.width
+    def winner(self, state):
+        table.new_search()
+        return self.controller.solver.winner(state)
 
-    def empty(self, i, j):
-        return self.inside(i, j) and (i, j) not in self.black | self.white
-
-    def get_moves(self):
-        """renvoie la liste des mouvements possibles sous la forme d'un ensemble de triplets
-        Le premier élément du triplet est le nouvel emplacement du pion. 
-        Les deux autres sont les pions qui disparaissent suite au mouvement : le premier est donc l'ancienne
-        position du pion qui bouge et le 2e est le pion adverse pris et donc peut-être à None si le mouvement n'est pas une prise
+    def parallel_winner(self, state, jobs, split_depth):
+        """gagnant de state calculé par jobs processus (moteur bitboard dans les processus), qui partagent
+        leur table avec l'option --shared
         """
-        positions = self.black, self.white
-        player = self.player
-        pawns, ennemies, moves = positions[player], positions[1 - player], MOVES[player]
-        return {move for i, j in pawns for move in self.get_moves_from(i, j, ennemies, moves)}
-
-    def get_moves_from(self, i, j, ennemies, moves):
-        """renvoie la liste des mouvements possibles pour le pion en i, j sous la même forme que get_moves"""
-        possible_moves = set()
-        # déplacements possibles
-        for di, dj in moves:
-            end_i, end_j = i + di, j + dj
-            if self.empty(end_i, end_j):
-                possible_moves.add(((end_i, end_j), (i, j), None))
-
-        # prises possibles
-        for di, dj in TAKES:
-            end_i, end_j = i + di, j + dj
-            if self.empty(end_i, end_j) and (i + di//2, j + dj//2) in ennemies:
-                possible_moves.add(((end_i, end_j), (i, j), (i+di//2, j+dj//2)))
-        return possible_moves
-
-    def new_state(self, move):
-        ''' Génération d'un nouvel état du jeu en jouant un coup'''
-        new_position, pawn_1, pawn_2 = move
-        positions = self.black, self.white
-        player = self.player
-        pawns, ennemies = positions[player], positions[1 - player]
-        new_pawns = pawns - {pawn_1} | {new_position} # frozenset 
-        new_ennemies = ennemies - {pawn_2}            # frozenset 
-        if player == BLACK:
-            return GameState(self.width, self.height, new_pawns, new_ennemies, WHITE)
-        else:
-            return GameState(self.width, self.height, new_ennemies, new_pawns, BLACK)
-
-    @cache
-    def winner(self):
-        player = self.player
-        moves = self.get_moves()
-        if len(moves) == 0:
-            return 1 - player
-        states_to_explore = set()
-        for m in moves:
-            next_state = self.new_state(m)
-            if len(next_state.get_moves()) == 0: 
-                return player
-            states_to_explore.add(next_state)
-        if all(state.winner() == 1 - player for state in states_to_explore):
-            return 1 - player
-        return player
+        if not isinstance(state, BitState):
+            state = BitState.create(state.width, state.height, state.black, state.white, state.player)
+        return parallel_winner(state, jobs, split_depth, shared=self.controller.shared,
+                               cancel=self.controller.worker.check)
+
+    def ia_move(self, state):
+        """coup de l'IA dans state (voir alquer/engine.py) ; appelé par le thread de calcul, le coup est joué
+        par le contrôleur
+        """
+        return self.controller.ai.move(state)
+
+    def print_variation(self, state):
+        """affiche la partie jouée depuis state par les meilleurs coups des deux joueurs (option --pv)"""
+        variation = principal_variation(self.controller.solver, state)
+        print(f'Variation principale, {len(variation)} coups :')
+        print('\n'.join(picture(state)))
+        for number, move in enumerate(variation, 1):
+            print(f'\n{number}. {KEYS[state.player]} {notation(state, move)}')
+            state = state.play(move)
+            print('\n'.join(picture(state)))
 
 
 class Alquerkonane:
@@ -246,10 +292,21 @@ class Alquerkonane:
         self.lines = lines if self.height > 2 else 1 # nombre de lignes de pions : 1 ou 2
         self.player_start = WHITE
         self.get_winner = False
+        self.variation = False
+        self.engine = 'sets'
+        self.jobs = 1
+        self.split_depth = 1
+        self.shared = False
+        self.database_path = None
+        self.solver = solver
+        self.ai = ExactAI(solver) # l'IA calcule le gagnant exact de chaque coup, voir --ai
         self.future_winner = None
         self.end = False
         self.model = None # initialisé plus tard avec le setup
         self.view = None  # initialisé plus tard avec le setup
+        self.drawn = {} # image affichée dans chaque case : seules les cases qui changent sont redessinées
+        self.worker = None # thread des calculs, démarré avec la vue
+        self.thinking = False # l'IA cherche son coup dans le thread de calcul
         self.selected = None # pour l'UI: indique donne les coordonnées du pion sélectionné
         self.landing = {} # pour l'UI : atterrissage possible d'un pion sélectionné
         
@@ -260,6 +317,17 @@ class Alquerkonane:
         parser.add_argument('-l', '--lines', help=HELP_L, type=int)
         parser.add_argument('-s', '--start', help=HELP_WHO_START)
         parser.add_argument('--win', help=HELP_GET_WINNER, action="store_true")
+        parser.add_argument('--pv', help=HELP_PV, action="store_true")
+        parser.add_argument('-m', '--memory', help=HELP_MEMORY, type=int)
+        parser.add_argument('-e', '--engine', help=HELP_ENGINE, choices=tuple(STATES))
+        parser.add_argument('-j', '--jobs', help=HELP_JOBS, type=int)
+        parser.add_argument('--split', help=HELP_SPLIT, type=int)
+        parser.add_argument('--shared', help=HELP_SHARED, action="store_true")
+        parser.add_argument('-d', '--database', help=HELP_DATABASE)
+        parser.add_argument('--solver', help=HELP_SOLVER, choices=tuple(SOLVERS))
+        parser.add_argument('--ai', help=HELP_AI, choices=tuple(AIS))
+        parser.add_argument('--think', help=HELP_THINK, type=float)
+        parser.add_argument('--profile', help=HELP_PROFILE, action="store_true")
 
         args = parser.parse_args()
         if args.width:
@@ -267,13 +335,54 @@ class Alquerkonane:
         if args.height:
             self.height = int(args.height)
         if args.lines:
-            self.lines = min(2, max(int(args.lines), 1))
-        if self.height <= 2:
-            self.lines = 1
+            self.lines = args.lines
+        self.lines = normalise_lines(self.height, self.lines)
         if args.start and args.start in '01':
             self.player_start = int(args.start)
         if args.win:
             self.get_winner = True
+        if args.pv:
+            self.variation = True
+        if args.memory:
+            table.resize(args.memory * 2**20)
+        if args.engine:
+            self.engine = args.engine
+        if args.jobs:
+            self.jobs = max(1, args.jobs)
+        if args.split:
+            self.split_depth = max(1, args.split)
+        if args.shared:
+            self.shared = True
+        self.solver = new_solver(args.solver or 'dfs', args.profile)
+        self.ai = AIS[args.ai or 'exact'](self.solver, args.think or 1.0)
+        if args.database:
+            self.database_path = args.database
+            if os.path.exists(args.database):
+                try:
+                    self.open_database()
+                except ValueError as error:
+                    parser.error(str(error))
+                if (solver.database.width, solver.database.height) != (self.width, self.height):
+                    parser.error(f'{args.database} contient des positions {solver.database.width}x{solver.database.height}')
+
+    def open_database(self):
+        # le solveur choisi et celui des processus de --jobs (recherche en profondeur) consultent la même base
+        solver.database = self.solver.database = Database(self.database_path)
+        if isinstance(self.ai, SearchAI):
+            self.ai.database = solver.database
+
+    def report(self):
+        """rapport des mesures de l'option --profile"""
+        profile = getattr(self.solver, 'profile', None)
+        if profile is not None and profile.solves:
+            print('\n'.join(profile.report()))
+
+    def save_database(self):
+        """ajoute les positions résolues pendant la partie au fichier de l'option --database"""
+        if self.database_path:
+            count = save(self.database_path, self.width, self.height, table, solver.database)
+            self.open_database()
+            print(f'{count} positions dans {self.database_path}')
             
     def set_view(self, end=False):
         content = {(i, j): EMPTY_FILES[(i + j)%2] for i in range(self.height) for j in range(self.width)}
@@ -286,8 +395,10 @@ class Alquerkonane:
             content[self.selected] = SELECTED_FILES[player]
             for landing_position in self.landing:
                 content[landing_position] = LANDING_FILES[player] 
-        for i, j in content:
-            self.view.set_grid(i, j, content[i, j])
+        for square, filename in content.items():
+            if self.drawn.get(square) != filename:
+                self.view.set_grid(*square, filename)
+        self.drawn = content
         self.set_text(end)        
 
     def set_text(self, end):
@@ -299,12 +410,12 @@ class Alquerkonane:
             current_positions_txt = TURN_MARK[player]
             if self.future_winner is not None:
                 future_winner_txt = WINNING_MARK[self.future_winner]
-                self.future_winner = None
             else:
                 future_winner_txt = '-', '-'
         self.view.set_text(current_positions_txt, future_winner_txt, self.model.scores())
 
     def reset(self):
+        self.cancel()
         self.model = Model(self)
         self.set_view()
         self.selected = None # pour l'UI: indique les coordonnées du pion sélectionné
@@ -330,40 +441,96 @@ class Alquerkonane:
         elif self.selected is not None and (i, j) in self.landing:
             move = self.landing[i, j]
             self.model.play(move)
-            self.future_winner = self.model.winner() if self.get_winner else None
+            self.update_winner()
             self.deselect()
 
+    def update_winner(self):
+        """demande au thread de calcul le gagnant de la position courante (option --win)"""
+        self.future_winner = None
+        if self.get_winner and not self.model.end:
+            self.worker.submit(WINNER_EVENT, self.model.winner, self.model.state())
+
+    def cancel(self):
+        """abandonne les calculs devenus inutiles (Undo, Reset)"""
+        self.worker.cancel()
+        self.thinking = False
+        self.future_winner = None
+        self.view.set_progress('')
+
+    def handle_result(self, event, value):
+        """résultat ou avancement d'un calcul du thread, ignoré s'il a été abandonné depuis"""
+        generation, value = value
+        if generation != self.worker.generation:
+            return
+        if event == PROGRESS_EVENT:
+            nodes, elapsed = value
+            self.view.set_progress(f'{nodes:,} positions, {elapsed:.1f}s'.replace(',', ' '))
+            return
+        result, elapsed = value
+        self.view.set_progress(f'{elapsed:.1f}s')
+        if event == WINNER_EVENT:
+            self.future_winner = result
+        elif event == AI_EVENT:
+            self.thinking = False
+            self.model.play(result)
+
     def loop(self):
+        import PySimpleGUI as sg
         while not self.end:
-            event = self.view.read()
+            if not self.model.end and self.model.player() == BLACK and not self.thinking:
+                self.thinking = True
+                self.worker.submit(AI_EVENT, self.model.ia_move, self.model.state())
+            event, value = self.view.read()
             if event == 'Exit' or event == sg.WIN_CLOSED:
+                self.worker.stop()
                 self.view.close()
+                self.report()
+                self.save_database()
                 self.end = True
+                continue
+            if event in (WINNER_EVENT, AI_EVENT, PROGRESS_EVENT):
+                self.handle_result(event, value)
             elif event == 'Reset':
                 self.reset()
+            elif event == 'Undo' and not self.model.end and (self.model.player() == WHITE or self.thinking):
+                # pendant la réflexion de l'IA, Undo annule le dernier coup de White
+                self.cancel()
+                self.model.undo()
+                self.update_winner()
             elif not self.model.end and self.model.player() == WHITE:
-                if event == 'Undo':
-                    self.model.undo()
-                    self.future_winner = self.model.winner() if self.get_winner else None
-                else:
-                    self.handle_click(event)
-            if self.model.player() == BLACK:
-                self.model.ia_play()
+                self.handle_click(event)
             self.set_view(self.model.end)
 
     def start(self):
-        # initialisation du modèle et de la vue
+        # la fenêtre s'ouvre tout de suite, le gagnant est calculé par le thread de calcul
         self.model = Model(self)
-        t_start =  perf_counter()
-        self.future_winner = self.model.winner()
+        self.view = View(self)
+        self.worker = Worker(self)
+        self.set_view()
+        state = self.model.state()
+        if self.jobs > 1:
+            self.worker.submit(WINNER_EVENT, self.start_winner, self.model.parallel_winner, state, self.jobs,
+                               self.split_depth)
+        else:
+            self.worker.submit(WINNER_EVENT, self.start_winner, self.model.winner, state)
+
+    def start_winner(self, winner, *args):
+        """calcul du gagnant de la position de départ, enregistré dans la base de l'option --database"""
+        t_start = perf_counter()
+        future_winner = winner(*args)
         perf = perf_counter() - t_start
-        print(f'Position gagnante pour {KEYS[self.future_winner]}')
+        print(f'Position gagnante pour {KEYS[future_winner]}')
         print(f'Calcul en {perf}s')
-        self.view = View(self)
-        self.set_view() 
+        if self.variation:
+            self.model.print_variation(args[0])
+        self.report()
+        self.save_database()
+        return future_winner 
      
 
-game = Alquerkonane()
-game.setup()
-game.start()
-game.loop()
\ No newline at end of file
+if __name__ == '__main__':
+    # la garde est nécessaire aux processus de calcul (--jobs) qui réimportent ce module
+    game = Alquerkonane()
+    game.setup()
+    game.start()
+    game.loop()
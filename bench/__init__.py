@@ -0,0 +1,24 @@
+"""
+Mesures de performance du moteur, sans interface graphique : python -m bench.<module>
+"""
+
+from alquer import BLACK, WHITE
+
+# lignes du tableau "Positions gagnantes" du README : largeur, hauteur, lignes, joueur qui commence, gagnant
+README_TABLE = (
+    (3, 3, 2, BLACK, BLACK),
+    (3, 3, 2, WHITE, BLACK),
+    (4, 4, 1, BLACK, WHITE),
+    (4, 4, 1, WHITE, BLACK),
+    (4, 4, 2, BLACK, BLACK),
+    (4, 4, 2, WHITE, WHITE),
+    (5, 5, 2, BLACK, BLACK),
+    (5, 5, 2, WHITE, BLACK),
+    (6, 6, 1, BLACK, BLACK),
+    (6, 6, 1, WHITE, WHITE),
+)
+
+
+def readme_table(max_size=None):
+    """lignes du tableau du README dont le damier a au plus max_size cases"""
+    return [row for row in README_TABLE if max_size is None or row[0] * row[1] <= max_size]
@@ -0,0 +1,86 @@
+"""
+Vérification du solveur itératif sur les configurations du README : même gagnant que la recherche
+récursive d'origine (reproduite ici) et pic mémoire de la recherche (tracemalloc) plus faible
+python -m bench.iterative [--max-size 25]
+"""
+
+import argparse
+import tracemalloc
+from time import perf_counter
+
+from alquer import BitState
+from alquer.solver import Solver
+from alquer.transposition import TranspositionTable
+
+from . import readme_table
+
+
+def recursive_winner(state, table):
+    """l'ancien BitState.winner : récursif, toutes les positions filles construites avant de descendre ; range
+    comme le solveur itératif la clé de la position fille du coup gagnant, pour comparer les pics à table égale
+    """
+    geo = state.geo
+    key = geo.canonical(state.key())
+    wins = table.get(key)
+    if wins is None:
+        player = state.player
+        moves = state.moves()
+        best = None
+        if len(moves) == 0:
+            wins = False
+        else:
+            states_to_explore = []
+            for m in moves:
+                next_state = state.play(m)
+                if len(next_state.moves()) == 0:
+                    wins = True
+                    break
+                states_to_explore.append(next_state)
+            else:
+                if geo.reduce and geo.symmetries.symmetric(state.key()):
+                    unique = {}
+                    for s in states_to_explore:
+                        unique.setdefault(geo.canonical(s.key()), s)
+                    states_to_explore = unique.values()
+                wins = False
+                for s in states_to_explore:
+                    if recursive_winner(s, table) == player:
+                        wins, best = True, geo.canonical(s.key())
+                        break
+        table.store(key, wins, (key >> 1).bit_count(), best)
+    return state.player if wins else 1 - state.player
+
+
+def measure(solve, state, max_bytes):
+    """gagnant, temps et pic mémoire (hors allocation de la table) d'une résolution"""
+    table = TranspositionTable(max_bytes)
+    table.allocate()
+    tracemalloc.start()
+    t_start = perf_counter()
+    result = solve(state, table)
+    elapsed = perf_counter() - t_start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--max-size', help="nombre maximal de cases du damier", type=int, default=25)
+    parser.add_argument('-m', '--memory', help="taille de la table de transposition en Mo", type=int, default=512)
+    args = parser.parse_args()
+
+    print(f"{'config':<12}{'gagnant':>8}{'récursif':>12}{'itératif':>12}{'pic réc.':>12}{'pic itér.':>12}")
+    for width, height, lines, player, expected in readme_table(args.max_size):
+        state = BitState.initial(width, height, lines, player)
+        result, elapsed, peak = measure(recursive_winner, state, args.memory * 2**20)
+        iterative_result, iterative_elapsed, iterative_peak = measure(
+            lambda state, table: Solver(table, ordering=None).winner(state), state, args.memory * 2**20)
+        assert result == iterative_result == expected, (width, height, lines, player)
+        assert iterative_peak <= peak, (width, height, lines, player, peak, iterative_peak)
+        print(f"{width}x{height}/{lines} {'BW'[player]:<4}{'BW'[result]:>8}{elapsed:>11.2f}s{iterative_elapsed:>11.2f}s"
+              f"{peak / 2**10:>10.0f}Ko{iterative_peak / 2**10:>10.0f}Ko")
+
+
+if __name__ == '__main__':
+    main()
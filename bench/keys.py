@@ -0,0 +1,70 @@
+"""
+Clés de position de GameState (alquer/state.py) mises à jour coup par coup : vérification et effet sur le calcul
+python -m bench.keys [--max-size 16]
+
+Pour chaque configuration du README : la clé de chaque position fille, obtenue par new_state, doit être celle
+recalculée depuis les ensembles de pions (l'ancien GameState.key, reproduit ici) ; deux positions
+atteignables différentes ne doivent jamais avoir la même clé. Puis le gagnant est calculé avec le moteur
+sets (GameState), dont les clés ne sont plus recalculées à chaque position.
+"""
+
+import argparse
+from time import perf_counter
+
+from alquer import BitState, GameState, geometry
+from alquer.retrograde import reachable
+from alquer.solver import Solver
+from alquer.transposition import TranspositionTable
+
+from . import readme_table
+
+
+def reference_key(state):
+    """l'ancien GameState.key"""
+    black = sum(1 << (i * state.width + j) for i, j in state.black)
+    white = sum(1 << (i * state.width + j) for i, j in state.white)
+    return (black << state.width * state.height | white) << 1 | state.player
+
+
+def check(width, height, lines):
+    """vérifie les clés des positions atteignables et de leurs filles, renvoie le nombre de positions"""
+    geo = geometry(width, height)
+    seen = {}
+    for key in reachable(width, height, lines):
+        bits = BitState.from_key(geo, key)
+        state = GameState(width, height, bits.black, bits.white, bits.player)
+        assert state.key() == reference_key(state) == key, (width, height, state)
+        for move in state.get_moves():
+            child = state.new_state(move)
+            assert child.key() == reference_key(child), (width, height, state, move)
+        positions = state.black, state.white, state.player
+        # collision : deux positions différentes, une même clé
+        assert seen.setdefault(state.key(), positions) == positions, (width, height, state)
+    return len(seen)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--max-size', help="nombre maximal de cases du damier", type=int, default=16)
+    args = parser.parse_args()
+
+    print(f"{'config':<9}{'joue':>6}{'positions':>11}{'gagnant':>9}{'temps':>9}{'positions/s':>13}")
+    checked = set()
+    for width, height, lines, start, expected in readme_table(args.max_size):
+        if (width, height, lines) not in checked:
+            checked.add((width, height, lines))
+            check(width, height, lines)
+        initial = BitState.initial(width, height, lines, start)
+        table = TranspositionTable()
+        table.allocate()
+        solver = Solver(table)
+        t_start = perf_counter()
+        winner = solver.winner(GameState(width, height, initial.black, initial.white, start))
+        elapsed = perf_counter() - t_start
+        assert winner == expected, (width, height, lines, start)
+        print(f"{width}x{height}/{lines:<4}{start:>6}{solver.nodes:>11}{winner:>9}{elapsed:>8.3f}s"
+              f"{solver.nodes / elapsed:>13.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Génération des coups de GameState (alquer/state.py) : tables précalculées par taille de damier contre l'ancienne
+version (reproduite ici) qui testait les bords et construisait les coordonnées de chaque direction
+python -m bench.moves [--max-size 16] [--repeat 3]
+
+Pour chaque configuration du README, get_moves est appelé sur toutes les positions atteignables
+(alquer/retrograde.py) ; les deux versions doivent donner les mêmes coups.
+"""
+
+import argparse
+from time import perf_counter
+
+from alquer import MOVES, TAKES, BitState, GameState, geometry
+from alquer.retrograde import reachable
+
+from . import readme_table
+
+
+def reference_moves(state):
+    """l'ancien GameState.get_moves"""
+    positions = state.black, state.white
+    player = state.player
+    pawns, ennemies, moves = positions[player], positions[1 - player], MOVES[player]
+
+    def inside(i, j):
+        return 0 <= i < state.height and 0 <= j < state.width
+
+    def empty(i, j):
+        return inside(i, j) and (i, j) not in state.black | state.white
+
+    possible_moves = set()
+    for i, j in pawns:
+        for di, dj in moves:
+            end_i, end_j = i + di, j + dj
+            if empty(end_i, end_j):
+                possible_moves.add(((end_i, end_j), (i, j), None))
+        for di, dj in TAKES:
+            end_i, end_j = i + di, j + dj
+            if empty(end_i, end_j) and (i + di//2, j + dj//2) in ennemies:
+                possible_moves.add(((end_i, end_j), (i, j), (i+di//2, j+dj//2)))
+    return possible_moves
+
+
+def measure(get_moves, states, repeat):
+    """meilleur temps de repeat passages sur states"""
+    best = None
+    for _ in range(repeat):
+        t_start = perf_counter()
+        for state in states:
+            get_moves(state)
+        elapsed = perf_counter() - t_start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--max-size', help="nombre maximal de cases du damier", type=int, default=16)
+    parser.add_argument('--repeat', help="nombre de passages, le meilleur temps est gardé", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'config':<9}{'positions':>11}{'avant':>14}{'tables':>14}{'gain':>7}")
+    done = set()
+    for width, height, lines, _, _ in readme_table(args.max_size):
+        if (width, height, lines) in done:
+            continue
+        done.add((width, height, lines))
+        geo = geometry(width, height)
+        states = []
+        for key in reachable(width, height, lines):
+            state = BitState.from_key(geo, key)
+            states.append(GameState(width, height, state.black, state.white, state.player))
+        for state in states:
+            assert state.get_moves() == reference_moves(state), (width, height, state)
+
+        before = measure(reference_moves, states, args.repeat)
+        after = measure(GameState.get_moves, states, args.repeat)
+        count = len(states)
+        print(f"{width}x{height}/{lines:<4}{count:>11}{count / before:>12.0f}/s{count / after:>12.0f}/s"
+              f"{before / after:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Effet de l'ordre des coups (alquer/ordering.py) sur les configurations du README : positions examinées et
+temps de calcul avec et sans ordre, et vérification qu'une même résolution examine toujours les mêmes positions,
+y compris dans d'autres processus et avec chaque moteur (le hachage de None, donc l'ordre d'un ensemble de coups,
+change d'un processus à l'autre)
+python -m bench.ordering [--max-size 16] [--runs 3]
+"""
+
+import argparse
+from multiprocessing import get_context
+from time import perf_counter
+
+from alquer import BitState
+from alquer.engine import STATES, initial_state
+from alquer.ordering import MoveOrdering
+from alquer.solver import Solver
+from alquer.transposition import TranspositionTable
+
+from . import readme_table
+
+
+def measure(state, ordering, max_bytes):
+    """gagnant, positions examinées et temps (hors allocation de la table) d'une résolution"""
+    table = TranspositionTable(max_bytes)
+    table.allocate()
+    solver = Solver(table, ordering=ordering)
+    t_start = perf_counter()
+    result = solver.winner(state)
+    return result, solver.nodes, perf_counter() - t_start
+
+
+def spawned_nodes(config):
+    """positions examinées par une résolution avec ordre, lancée dans un processus neuf"""
+    width, height, lines, player, engine, max_bytes = config
+    return measure(initial_state(engine, width, height, lines, player), MoveOrdering(), max_bytes)[1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--max-size', help="nombre maximal de cases du damier", type=int, default=16)
+    parser.add_argument('-m', '--memory', help="taille de la table de transposition en Mo", type=int, default=512)
+    parser.add_argument('--runs', help="processus par moteur pour vérifier le déterminisme", type=int, default=3)
+    args = parser.parse_args()
+    max_bytes = args.memory * 2**20
+    # spawn : un processus neuf, dont le hachage de None diffère, et non une copie de celui-ci
+    pool = get_context('spawn').Pool(1, maxtasksperchild=1)
+
+    print(f"{'config':<12}{'gagnant':>8}{'noeuds':>12}{'ordonnés':>12}{'temps':>9}{'ordonné':>9}")
+    for width, height, lines, player, expected in readme_table(args.max_size):
+        state = BitState.initial(width, height, lines, player)
+        result, nodes, elapsed = measure(state, None, max_bytes)
+        ordering = MoveOrdering()
+        ordered_result, ordered_nodes, ordered_elapsed = measure(state, ordering, max_bytes)
+        assert result == ordered_result == expected, (width, height, lines, player)
+        # l'ordre est déterministe : une seconde résolution examine exactement les mêmes positions
+        assert measure(state, ordering, max_bytes)[1] == ordered_nodes
+        for engine in STATES:
+            config = width, height, lines, player, engine, max_bytes
+            counts = pool.map(spawned_nodes, [config] * args.runs, chunksize=1)
+            assert len(set(counts)) == 1, (width, height, lines, player, engine, counts)
+        print(f"{width}x{height}/{lines} {'BW'[player]:<4}{'BW'[result]:>8}{nodes:>12}{ordered_nodes:>12}"
+              f"{elapsed:>8.2f}s{ordered_elapsed:>8.2f}s")
+    pool.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Comparaison de la recherche par nombres de preuve (df-pn) et de la recherche en profondeur sur les
+configurations du README : gagnant, positions développées et temps de calcul
+python -m bench.pns [--max-size 16]
+"""
+
+import argparse
+from time import perf_counter
+
+from alquer import BitState
+from alquer.pns import ProofNumberSolver
+from alquer.solver import Solver
+from alquer.transposition import TranspositionTable
+
+from . import readme_table
+
+
+def measure(solver, state):
+    """gagnant, positions développées et temps (hors allocation de la table) d'une résolution"""
+    solver.table.allocate()
+    t_start = perf_counter()
+    result = solver.winner(state)
+    return result, solver.nodes, perf_counter() - t_start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--max-size', help="nombre maximal de cases du damier", type=int, default=16)
+    parser.add_argument('-m', '--memory', help="taille de la table de transposition en Mo", type=int, default=512)
+    args = parser.parse_args()
+
+    print(f"{'config':<12}{'gagnant':>8}{'noeuds dfs':>12}{'noeuds pn':>12}{'temps dfs':>11}{'temps pn':>11}")
+    for width, height, lines, player, expected in readme_table(args.max_size):
+        state = BitState.initial(width, height, lines, player)
+        result, nodes, elapsed = measure(Solver(TranspositionTable(args.memory * 2**20)), state)
+        pn_result, pn_nodes, pn_elapsed = measure(ProofNumberSolver(TranspositionTable(args.memory * 2**20)), state)
+        assert result == pn_result == expected, (width, height, lines, player)
+        print(f"{width}x{height}/{lines} {'BW'[player]:<4}{'BW'[result]:>8}{nodes:>12}{pn_nodes:>12}"
+              f"{elapsed:>10.2f}s{pn_elapsed:>10.2f}s")
+
+
+if __name__ == '__main__':
+    main()
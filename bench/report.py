@@ -0,0 +1,122 @@
+"""
+Mesures du jeu sans interface graphique, au format JSON pour suivre les régressions d'une version à l'autre
+python -m bench.report [--max-size 25] [--engine both] [-o report.json]
+
+Pour chaque ligne du tableau du README et chaque moteur (GameState, BitState) : débit de get_moves et de
+new_state sur un échantillon fixe de positions, puis calcul complet du gagnant par le solveur partagé avec
+positions examinées par seconde, taille de la table de transposition et pic de mémoire (RSS) du processus.
+Chaque configuration est mesurée dans un processus neuf, pour que le pic de mémoire soit le sien.
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+from multiprocessing import Pool
+from time import perf_counter
+
+from alquer.engine import initial_state
+from alquer.solver import solver
+from alquer.transposition import table
+
+from . import readme_table
+
+SAMPLE = 2000
+
+
+def sample(state, count):
+    """les count premières positions d'un parcours en profondeur depuis state, toujours les mêmes"""
+    positions = []
+    stack = [state]
+    seen = set()
+    while stack and len(positions) < count:
+        state = stack.pop()
+        if state in seen:
+            continue
+        seen.add(state)
+        positions.append(state)
+        for move in sorted(state.get_moves(), key=repr):
+            stack.append(state.new_state(move))
+    return positions
+
+
+def rate(calls, elapsed):
+    return round(calls / elapsed) if elapsed > 0 else None
+
+
+def measure(config):
+    width, height, lines, player, engine = config
+    root = initial_state(engine, width, height, lines, player)
+    positions = sample(root, SAMPLE)
+
+    t_start = perf_counter()
+    moves = [state.get_moves() for state in positions]
+    get_moves_elapsed = perf_counter() - t_start
+    t_start = perf_counter()
+    new_states = 0
+    for state, state_moves in zip(positions, moves):
+        for move in state_moves:
+            state.new_state(move)
+        new_states += len(state_moves)
+    new_state_elapsed = perf_counter() - t_start
+
+    # la table est allouée hors de la mesure
+    table.clear()
+    table.allocate()
+    solver.nodes = 0
+    t_start = perf_counter()
+    winner = solver.winner(root)
+    elapsed = perf_counter() - t_start
+    return {
+        'width': width, 'height': height, 'lines': lines, 'start': player, 'engine': engine,
+        'winner': winner,
+        'get_moves_per_s': rate(len(positions), get_moves_elapsed),
+        'new_state_per_s': rate(new_states, new_state_elapsed),
+        'solve_s': round(elapsed, 4),
+        'nodes': solver.nodes,
+        'nodes_per_s': rate(solver.nodes, elapsed),
+        'cache_entries': len(table),
+        'cache_hits': table.hits,
+        'cache_misses': table.misses,
+        # ru_maxrss est en Ko sous Linux, en octets sous macOS
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (1024 if sys.platform == 'darwin' else 1),
+    }
+
+
+def revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--max-size', help="nombre maximal de cases du damier", type=int, default=25)
+    parser.add_argument('-e', '--engine', help="moteur mesuré", choices=('sets', 'bits', 'both'), default='both')
+    parser.add_argument('-o', '--output', help="fichier JSON, sortie standard par défaut")
+    args = parser.parse_args()
+    engines = ('sets', 'bits') if args.engine == 'both' else (args.engine,)
+
+    configs = [(width, height, lines, player, engine)
+               for width, height, lines, player, _ in readme_table(args.max_size) for engine in engines]
+    with Pool(1, maxtasksperchild=1) as pool:
+        results = pool.map(measure, configs, chunksize=1)
+    expected = {(width, height, lines, player): winner for width, height, lines, player, winner in readme_table()}
+    for result in results:
+        result['expected'] = expected[result['width'], result['height'], result['lines'], result['start']]
+
+    report = {'revision': revision(), 'python': platform.python_version(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+
+
+if __name__ == '__main__':
+    main()
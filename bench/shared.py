@@ -0,0 +1,45 @@
+"""
+Calcul réparti (alquer/parallel.py) avec une table par processus ou une table en mémoire partagée
+python -m bench.shared [-W 5] [-H 5] [-l 2] [-s 1] [--split 2] [--jobs 1 2 4 8] [--memory 256]
+
+Pour chaque nombre de processus, le gagnant est calculé avec des tables privées puis avec la table partagée
+(alquer/shared.py) ; les temps sont comparés à celui d'un seul processus avec table privée.
+"""
+
+import argparse
+import os
+from time import perf_counter
+
+from alquer import BitState
+from alquer.engine import board_arguments, normalise_lines
+from alquer.parallel import parallel_winner
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    board_arguments(parser, width=5, height=5, memory_help='Taille (en Mo) de chaque table')
+    parser.add_argument('--split', help="profondeur de la répartition", type=int, default=2)
+    parser.add_argument('--jobs', help="nombres de processus", type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    lines = normalise_lines(args.height, args.lines)
+    state = BitState.initial(args.width, args.height, lines, args.start)
+    max_bytes = args.memory * 2**20
+
+    print(f'{args.width}x{args.height}/{lines}, {os.cpu_count()} coeurs')
+    print(f"{'processus':>9}{'privées':>10}{'gain':>7}{'partagée':>10}{'gain':>7}")
+    reference = None
+    for jobs in args.jobs:
+        times = []
+        winners = set()
+        for shared in (False, True):
+            t_start = perf_counter()
+            winners.add(parallel_winner(state, jobs, args.split, max_bytes, shared))
+            times.append(perf_counter() - t_start)
+        assert len(winners) == 1, (jobs, winners)
+        reference = reference or times[0]
+        private, shared = times
+        print(f'{jobs:>9}{private:>9.2f}s{reference / private:>6.1f}x{shared:>9.2f}s{reference / shared:>6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
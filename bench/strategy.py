@@ -0,0 +1,76 @@
+"""
+Coup de l'IA exacte : coup gagnant lu dans la table (alquer/strategy.py) contre l'ancienne recherche (reproduite
+ici) qui calculait le gagnant de chaque position fille à chaque coup
+python -m bench.strategy [--max-size 25] [-m 512]
+
+Pour chaque configuration du README, le gagnant est calculé puis l'IA joue les deux camps jusqu'à la fin de la
+partie, une fois avec chaque version et une table neuve ; le gagnant de la partie doit être celui de la position
+de départ. Sont affichés le temps moyen et le temps maximal d'un coup, puis la taille de la stratégie gagnante.
+"""
+
+import argparse
+import os
+import tempfile
+from time import perf_counter
+
+from alquer import BitState
+from alquer.ordering import ordering
+from alquer.solver import Solver
+from alquer.strategy import check, export, reply
+from alquer.transposition import TranspositionTable
+
+from . import readme_table
+
+
+def reference_move(search, state):
+    """l'ancien Model.ia_move"""
+    moves = state.moves()
+    moves = ordering.order(moves, 0, [state.play(m).count_moves() for m in moves])
+    for m in moves:
+        if search.winner(state.play(m)) == state.player:
+            return m
+    return moves[0]
+
+
+def game(choose, state, max_bytes):
+    """(gagnant, temps des coups) d'une partie jouée par choose après le calcul du gagnant de state"""
+    search = Solver(TranspositionTable(max_bytes))
+    search.winner(state)
+    times = []
+    while state.has_moves():
+        t_start = perf_counter()
+        move = choose(search, state)
+        times.append(perf_counter() - t_start)
+        state = state.play(move)
+    return 1 - state.player, times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--max-size', help="nombre maximal de cases du damier", type=int, default=25)
+    parser.add_argument('-m', '--memory', help="taille de la table de transposition en Mo", type=int, default=512)
+    args = parser.parse_args()
+    max_bytes = args.memory * 2**20
+
+    print(f"{'config':<9}{'joue':>5}{'coups':>6}{'avant moy.':>12}{'max':>10}{'table moy.':>12}{'max':>10}"
+          f"{'stratégie':>11}{'octets':>10}")
+    for width, height, lines, start, expected in readme_table(args.max_size):
+        state = BitState.initial(width, height, lines, start)
+        results = []
+        for choose in (reference_move, reply):
+            winner, times = game(choose, state, max_bytes)
+            assert winner == expected, (width, height, lines, start, choose.__name__)
+            results.append(times)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'strategy')
+            count = export(Solver(TranspositionTable(max_bytes)), state, path)
+            assert check(path) == count
+            size = os.path.getsize(path)
+        (before, after) = results
+        print(f"{width}x{height}/{lines:<4}{start:>5}{len(after):>6}"
+              f"{sum(before) / len(before) * 1000:>10.3f}ms{max(before) * 1000:>8.2f}ms"
+              f"{sum(after) / len(after) * 1000:>10.3f}ms{max(after) * 1000:>8.2f}ms{count:>11}{size:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Gain de la réduction par symétrie sur les configurations du README :
+nombre de positions résolues (entrées de la table) et temps de calcul, avec et sans réduction
+python -m bench.symmetry [--max-size 25]
+"""
+
+import argparse
+from time import perf_counter
+
+from alquer import BitState, geometry
+from alquer.transposition import table, ENTRY_BYTES
+
+from . import readme_table
+
+
+def solve(width, height, lines, player, reduce):
+    geometry(width, height).reduce = reduce
+    table.clear()
+    table.allocate()
+    t_start = perf_counter()
+    result = BitState.initial(width, height, lines, player).winner()
+    return result, len(table), perf_counter() - t_start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--max-size', help="nombre maximal de cases du damier", type=int, default=25)
+    parser.add_argument('-m', '--memory', help="taille de la table de transposition en Mo", type=int, default=512)
+    args = parser.parse_args()
+    table.resize(args.memory * 2**20)
+
+    print(f"{'config':<12}{'symétries':<28}{'positions':>12}{'réduites':>12}{'gain':>8}{'temps':>9}{'réduit':>9}")
+    for width, height, lines, player, _ in readme_table(args.max_size):
+        geo = geometry(width, height)
+        names = ', '.join(geo.symmetries.names()) or '-'
+        result, states, elapsed = solve(width, height, lines, player, False)
+        reduced_result, reduced_states, reduced_elapsed = solve(width, height, lines, player, bool(geo.symmetries))
+        assert result == reduced_result
+        print(f"{width}x{height}/{lines} {'BW'[player]:<4}{names:<28}{states:>12}{reduced_states:>12}"
+              f"{1 - reduced_states / states:>8.1%}{elapsed:>8.2f}s{reduced_elapsed:>8.2f}s")
+    print(f"(une entrée de table occupe au plus {ENTRY_BYTES} octets)")
+
+
+if __name__ == '__main__':
+    main()
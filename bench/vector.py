@@ -0,0 +1,68 @@
+"""
+Génération des coups par lots NumPy (alquer/vector.py) : vérification et débit
+python -m bench.vector [--max-size 16]
+
+Pour chaque configuration du README, toutes les positions atteignables (alquer/retrograde.py) forment un lot :
+les coups calculés par lot sont comparés à ceux de GameState.get_moves, puis le débit (positions développées
+par seconde, coups et positions filles compris) est comparé à celui de BitState.moves / play.
+"""
+
+import argparse
+from time import perf_counter
+
+from alquer import BitState, GameState, geometry
+from alquer.retrograde import reachable
+from alquer.vector import encode, successors
+
+from . import readme_table
+
+
+def check(width, height, states, batch):
+    """les coups du lot sont-ils ceux de GameState.get_moves ?"""
+    square = geometry(width, height).square
+    found = [set() for _ in states]
+    for parent, start, end, taken in zip(batch['parent'], batch['start'], batch['end'], batch['taken']):
+        found[parent].add((square(int(end)), square(int(start)), square(int(taken)) if taken else None))
+    for state, moves in zip(states, found):
+        expected = GameState(width, height, state.black, state.white, state.player).get_moves()
+        assert moves == expected, (width, height, state)
+    # les positions filles sont celles de BitState.play (sur un échantillon)
+    for index in range(0, len(batch['parent']), max(1, len(batch['parent']) // 1000)):
+        parent = states[batch['parent'][index]]
+        child = parent.play((int(batch['start'][index]), int(batch['end'][index]), int(batch['taken'][index])))
+        assert (child.black_bits, child.white_bits, child.player) == (
+            int(batch['black'][index]), int(batch['white'][index]), int(batch['player'][index])), (width, height, parent)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--max-size', help="nombre maximal de cases du damier", type=int, default=16)
+    args = parser.parse_args()
+
+    print(f"{'config':<9}{'positions':>11}{'coups':>10}{'python':>14}{'numpy':>14}{'gain':>7}")
+    done = set()
+    for width, height, lines, _, _ in readme_table(args.max_size):
+        if (width, height, lines) in done:
+            continue
+        done.add((width, height, lines))
+        geo = geometry(width, height)
+        states = [BitState.from_key(geo, key) for key in reachable(width, height, lines)]
+        black, white, player = encode(states)
+
+        t_start = perf_counter()
+        batch = successors(width, height, black, white, player)
+        vector_elapsed = perf_counter() - t_start
+        t_start = perf_counter()
+        for state in states:
+            for move in state.moves():
+                state.play(move)
+        python_elapsed = perf_counter() - t_start
+
+        check(width, height, states, batch)
+        count = len(states)
+        print(f"{width}x{height}/{lines:<4}{count:>11}{len(batch['parent']):>10}{count / python_elapsed:>12.0f}/s"
+              f"{count / vector_elapsed:>12.0f}/s{python_elapsed / vector_elapsed:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()